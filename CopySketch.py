@@ -1,12 +1,17 @@
 # #Author-Robin Debreuil
 # #Description-Copies sketch points, lines, constraints and dimensions, including parameters. Optionally relative to a guideline for relative pasting.
 
-import adsk.core, adsk.fusion, traceback
+import adsk.core, adsk.fusion, traceback, io
 from .tlib.TurtleUtils import TurtleUtils
 from .tlib.TurtleUICommand import TurtleUICommand
 from .tlib.TurtleSketch import TurtleSketch
 from .tlib.TurtleEncoder import TurtleEncoder
+from .tlib.TurtleParams import TurtleParams
 from .tlib.data.SketchData import SketchData
+from .tlib.data.SketchDataBinary import SketchDataBinary
+from .tlib.data.SketchDataCache import SketchDataCache
+from .tlib.data.SketchDataBundle import SketchDataBundle
+from .tlib.data.SketchDataLoader import SketchDataLoader
 
 f:adsk.fusion
 core:adsk.core
@@ -84,6 +89,8 @@ class CopySketchCommand(TurtleUICommand):
             saveGroup = inputs.addGroupCommandInput("saveGroup", "Save To Disk")
             self.btSaveText = saveGroup.children.addButtonRowCommandInput("btSaveText", "Save Sketch", False)
             self.btSaveText.listItems.add('Save Sketch', False, 'resources/ddwPasteSketchId')
+            self.btSaveBundle = saveGroup.children.addButtonRowCommandInput("btSaveBundle", "Save Selected As Bundle", False)
+            self.btSaveBundle.listItems.add('Save Bundle', False, 'resources/ddwPasteSketchId')
 
             self._resetUI()
         except:
@@ -129,10 +136,26 @@ class CopySketchCommand(TurtleUICommand):
                 else:
                     filename = self._saveSketch()
                     if filename != "":
+                        SketchDataCache.invalidatePath(filename)
                         np = self._getNamedProfiles()
-                        enc = TurtleEncoder(self.sketch, self.guideElement, np)
-                        SketchData.saveData(filename, enc.encodedSketch)
+                        if filename.lower().endswith(".tskb"):
+                            text = io.StringIO()
+                            TurtleEncoder(self.sketch, self.guideElement, np, text)
+                            SketchDataBinary.writeTextAsBinary(text.getvalue(), filename)
+                        else:
+                            with open(filename, "w") as file: # stream straight to disk, leaves the clipboard alone
+                                TurtleEncoder(self.sketch, self.guideElement, np, file)
                     self.btSaveText.listItems.clear()
+
+            elif cmdInput.id == 'btSaveBundle':
+                if len(self.btSaveBundle.listItems) == 0: # same re-enable hack as the save button
+                    self.btSaveBundle.listItems.add('Save Bundle', False, 'resources/ddwPasteSketchId')
+                else:
+                    filename = self._saveBundle()
+                    if filename != "":
+                        SketchDataCache.invalidatePath(filename)
+                        SketchDataBundle.writeFile(filename, self._encodeSelectedSketches())
+                    self.btSaveBundle.listItems.clear()
                 
             elif cmdInput.parentCommandInput == self.tbProfiles:
                 success, row, col, addcol, addrow = self.tbProfiles.getPosition(cmdInput)
@@ -268,12 +291,39 @@ class CopySketchCommand(TurtleUICommand):
             self.sketchSelection.isVisible = True
             self.sketchText.isVisible = False
 
+    def _encodeSelectedSketches(self):
+        # every selected sketch, the design's parameters are read once for all of them
+        sketches = [self.sketchSelection.selection(i).entity for i in range(self.sketchSelection.selectionCount)]
+        if self.sketch and self.sketch not in sketches:
+            sketches.insert(0, self.sketch)
+        params = TurtleParams.instance().getUserParams()
+        result = []
+        for sketch in sketches:
+            guideElement = self.guideElement if self.guideElement and self.guideElement.parentSketch == sketch else None
+            np = self._getNamedProfiles() if sketch == self.sketch else {}
+            text = io.StringIO()
+            TurtleEncoder(sketch, guideElement, np, text, params = params)
+            result.append((sketch.name, SketchDataLoader.loadSketchData(text.getvalue())))
+        return result
+
+    def _saveBundle(self):
+        result = ""
+        fileDialog = ui.createFileDialog()
+        fileDialog.isMultiSelectEnabled = False
+        fileDialog.title = "Save Sketch Bundle"
+        fileDialog.filter = 'Turtle Sketch Bundles (*.tsks)'
+        fileDialog.filterIndex = 0
+        dialogResult = fileDialog.showSave()
+        if dialogResult == core.DialogResults.DialogOK:
+            result = fileDialog.filename
+        return result
+
     def _saveSketch(self):
         result = ""
         fileDialog = ui.createFileDialog()
         fileDialog.isMultiSelectEnabled = False
         fileDialog.title = "Save Sketch"
-        fileDialog.filter = 'Turtle Sketch Files (*.tsk)'
+        fileDialog.filter = 'Turtle Sketch Files (*.tsk);;Turtle Binary Sketch Files (*.tskb)'
         fileDialog.filterIndex = 0
         dialogResult = fileDialog.showSave()
         if dialogResult == core.DialogResults.DialogOK:
@@ -10,6 +10,7 @@ from .tlib.TurtleComponent import TurtleComponent
 from .tlib.TurtleLayers import TurtleLayers
 from .tlib.TurtleLayerData import TurtleLayerData
 from .tlib.TurtleCustomCommand import TurtleCustomCommand
+from .tlib.data.SketchDataLoader import SketchDataLoader
 
 f:adsk.fusion
 core:adsk.core
@@ -361,11 +362,7 @@ class ExtrudeLayersCommand(TurtleCustomCommand):
 
     def _extrude(self, tComp:TurtleComponent):            
         count = len(self.stateTable)
-        for i, state in enumerate(self.stateTable):
-            ddIndex = self.stateTable[i][0]
-            paramVal = self.params.getParamExprOrDefault(self.thicknessParamNames[ddIndex])
-            if paramVal != state[1]:
-                self.params.setOrCreateParam(self.thicknessParamNames[ddIndex], state[1])
+        self.params.setParams({self.thicknessParamNames[state[0]]:state[1] for state in self.stateTable})
         distances = []
         for state in self.stateTable:
             distances.append(self.thicknessParamNames[state[0]]) # use param names for final extrude thickness
@@ -377,7 +374,7 @@ class ExtrudeLayersCommand(TurtleCustomCommand):
             appearanceList.reverse()
 
         layerDataList = TurtleLayerData.createLayerDataList([self.selectedProfiles], distances, self.bFlipDirection.value)
-        result, newFeatures = TurtleLayers.createWithLayerData(tComp, layerDataList, appearanceList)
+        result, newFeatures = TurtleLayers.createWithLayerData(tComp, layerDataList, appearanceList, True)
         return result, newFeatures
         
 
@@ -458,7 +455,7 @@ class ExtrudeLayersCommand(TurtleCustomCommand):
         return result
 
     def _decodeDialogState(self, encoding):
-        return eval(encoding)
+        return SketchDataLoader.loadLiteral(encoding)
 
     def _writeDefaultLayerIndexes(self):
         encoding = self._encodeDialogState()
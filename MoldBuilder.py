@@ -17,6 +17,9 @@ from .tlib.TurtleComponent import TurtleComponent
 from .tlib.TurtleLayers import TurtleLayers
 from .tlib.TurtleCustomCommand import TurtleCustomCommand
 from .tlib.TurtleDecoder import TurtleDecoder
+from .tlib.MoldPlan import MoldPlan
+from .tlib.MoldLayout import MoldLayout
+from .tlib.MoldPreview import MoldPreview
 from .tlib.data.SketchData import Sketches, SketchData
 
 f:adsk.fusion
@@ -37,6 +40,9 @@ class MoldBuilder(TurtleCustomCommand):
 
         self.faceMap = {}
         self.wallBodiesMap = {}
+        self.plan:MoldPlan = None
+        self.layout:MoldLayout = None
+        self.preview:MoldPreview = None
         self.outerWidth  = 1
         self.outerHeight = 1
         self.outerDepth  = 1
@@ -71,43 +77,81 @@ class MoldBuilder(TurtleCustomCommand):
         # investigations of a shelled box
         self.component:f.Component = TurtleUtils.activeDesign().activeComponent
         self.tComponent:TurtleComponent = TurtleComponent.createFromExisting(self.component)
-        if not self.component.bRepBodies.count == 1 or not self.component.bRepBodies.item(0).faces.count == 11:
+        self.body = self.findSourceBody()
+        if not self.body:
             return
         self._parseFaces()
         self._createDialog(eventArgs.command.commandInputs)
 
+    def findSourceBody(self) -> f.BRepBody:
+        # the shelled box, walls from an earlier build are tagged with their wallKind and skipped
+        for body in self.component.bRepBodies:
+            if not body.attributes.itemByName("Turtle", "wallKind") and body.faces.count == 11:
+                return body
+        return None
+
     def onInputsChanged(self, eventArgs:core.InputChangedEventArgs):
         pass
 
     def onPreview(self, eventArgs:core.CommandEventArgs):
         self.setParameters()
-        self.createSpecificWalls([WallKind.rightInner])#WallKind.backInner, WallKind.leftOuter, WallKind.bottomInner])
+        if self.diagFastPreview.value:
+            self.createPreviewWalls()
+        else:
+            self.createSpecificWalls([WallKind.rightInner])#WallKind.backInner, WallKind.leftOuter, WallKind.bottomInner])
         self.body.opacity = 0.2
 
     def onExecute(self, eventArgs:core.CommandEventArgs):
         #return self.onPreview(eventArgs)
+        self.clearPreview()
         self.setParameters()
         self.createAllWalls()
         self.body.isVisible = False
 
     def calcSlotCount(self, len, isInner = True)->int:
-        thickness = self.wallThicknessVal * 2
-        reservedLen = thickness * 2 if isInner else thickness
-        return max(1, int((len - reservedLen) / self.slotTotalLen))
+        return MoldLayout.calcSlotCount(len, self.wallThicknessVal, self.slotTotalLen, isInner)
+
+    def createLayout(self) -> MoldLayout:
+        return MoldLayout.create((self.outerWidth, self.outerDepth, self.outerHeight), (self.innerWidth, self.innerDepth, self.innerHeight),\
+            self.wallThicknessVal, self.slotLengthVal, self.slotSpaceVal)
 
     def setWallData(self):
-        self.slotCountInnerWidth = self.calcSlotCount(self.innerWidth)
-        self.slotCountInnerDepth = self.calcSlotCount(self.innerDepth)
-        self.slotCountInnerHeight = self.calcSlotCount(self.innerHeight)
-        self.slotCountOuterWidth = self.calcSlotCount(self.outerWidth, False)
-        self.slotCountOuterDepth = self.calcSlotCount(self.outerDepth, False)
-        self.slotCountOuterHeight = self.calcSlotCount(self.outerHeight, False)
-
-        self.xMidplane = self.tComponent.createMidplane(self.leftOuterFace.face, self.rightOuterFace.face, "xMidplane")
-        self.yMidplane = self.tComponent.createMidplane(self.frontOuterFace.face, self.backOuterFace.face, "yMidplane")
-        self.zMidplane = self.tComponent.createMidplane(self.topOuterFace.face, self.bottomOuterFace.face, "zMidplane")
-        self.zInnerMidplane = self.tComponent.createOffsetPlane(self.bottomInnerFace.face, "("+str(self.innerHeight) + "cm + wallThickness)/2", "zInnerMidplane")
-        
+        self.setLayoutData()
+        # midplanes follow the box faces, so ones made by an earlier run are reused
+        planes = self.component.constructionPlanes
+        self.xMidplane = planes.itemByName("xMidplane") or \
+            self.tComponent.createMidplane(self.leftOuterFace.face, self.rightOuterFace.face, "xMidplane")
+        self.yMidplane = planes.itemByName("yMidplane") or \
+            self.tComponent.createMidplane(self.frontOuterFace.face, self.backOuterFace.face, "yMidplane")
+        self.zMidplane = planes.itemByName("zMidplane") or \
+            self.tComponent.createMidplane(self.topOuterFace.face, self.bottomOuterFace.face, "zMidplane")
+        self.zInnerMidplane = self.getInnerMidplane("(" + str(self.innerHeight) + "cm + wallThickness)/2")
+        self.wallBodiesMap.clear()
+
+    def getInnerMidplane(self, offsetExpr:str) -> f.ConstructionPlane:
+        # the offset bakes in the inner height, so a reused plane is moved to the current one
+        plane = self.component.constructionPlanes.itemByName("zInnerMidplane")
+        if not plane:
+            return self.tComponent.createOffsetPlane(self.bottomInnerFace.face, offsetExpr, "zInnerMidplane")
+        definition:f.ConstructionPlaneOffsetDefinition = plane.definition
+        if isinstance(definition.offset, f.ModelParameter):
+            if definition.offset.expression != offsetExpr:
+                definition.offset.expression = offsetExpr
+        else: # direct modeling has no parameter to edit
+            definition.redefine(self.parameters.createValue(offsetExpr), self.bottomInnerFace.face)
+        return plane
+
+    def setLayoutData(self):
+        # slot counts, wall table and layout only, no features are created here so the preview can use it
+        self.layout = self.createLayout()
+        slotCounts = self.layout.slotCounts
+        self.slotCountInnerWidth = slotCounts["innerWidth"]
+        self.slotCountInnerDepth = slotCounts["innerDepth"]
+        self.slotCountInnerHeight = slotCounts["innerHeight"]
+        self.slotCountOuterWidth = slotCounts["outerWidth"]
+        self.slotCountOuterDepth = slotCounts["outerDepth"]
+        self.slotCountOuterHeight = slotCounts["outerHeight"]
+
         self.wallData = {
             WallKind.topOuter:[[SlotKind.hole, self.slotCountOuterWidth], [SlotKind.hole, self.slotCountOuterDepth],\
                 [SlotKind.hole, self.slotCountInnerWidth, True], [SlotKind.hole, self.slotCountInnerDepth, True]],
@@ -120,29 +164,127 @@ class MoldBuilder(TurtleCustomCommand):
             WallKind.leftOuter:[[SlotKind.fingerLock, self.slotCountOuterDepth], [SlotKind.fingerLock, self.slotCountOuterHeight]],
             WallKind.rightInner:[[[SlotKind.fingerExtend, SlotKind.fingerLock], self.slotCountInnerDepth], [SlotKind.fingerPokeLock, self.slotCountInnerHeight]],
         }
-        self.wallBodiesMap.clear()
+
+    def wallSlotCounts(self) -> dict[int, list[int]]:
+        # slot count per edge pair for each wall, keyed by wall kind value as MoldLayout expects
+        return {wallKind.value:[edge[1] for edge in edges] for wallKind, edges in self.wallData.items()}
+
+    def planWalls(self, wallKinds:list[WallKind] = None) -> MoldPlan:
+        # walls, cuts and slot positions as plain data, before any features are created
+        self.plan = MoldPlan.createFromWallData(self.wallData, self.getSlotSketchForSlotKind, wallKinds)
+        for kind, counts in self.wallSlotCounts().items():
+            self.layout.layoutWall(kind, counts)
+        return self.plan
 
     def createSpecificWalls(self, wallKinds:list[SlotKind]):
         self.setWallData()
-        for key in wallKinds:
-            self.createWall(key, self.wallData[key])
+        self.planWalls(wallKinds)
+        for wallPlan in self.plan.walls:
+            self.createWall(wallPlan.wallKind, self.wallData[wallPlan.wallKind])
         self.tComponent.component.isConstructionFolderLightBulbOn = False
 
     def createAllWalls(self):
+        # Only walls whose input hash changed since the last run are rebuilt, the others keep their timeline features.
+        # Each wall's features are kept in a named timeline group so they can be removed as a unit.
         self.setWallData()
-        for key in self.wallData:
-            self.createWall(key, self.wallData[key])
+        self.planWalls()
+        hashes = {wallPlan.wallKind:self.wallInputHash(wallPlan.wallKind) for wallPlan in self.plan.walls}
+        changed = [wallPlan for wallPlan in self.plan.walls if hashes[wallPlan.wallKind] != self.getStoredWallHash(wallPlan.wallKind)]
+        if TurtleUtils.activeDesign().designType != f.DesignTypes.ParametricDesignType:
+            # no timeline groups to remove, and the last run's cuts changed its bodies in place, so every wall is redone
+            self.deleteWallBodies()
+            changed = self.plan.walls
+        if not changed and self.findTimelineGroup(self.combineGroupName):
+            return
+
+        # combines depend on every wall body, so they are removed first and always redone
+        self.deleteTimelineGroup(self.combineGroupName)
+        for wallPlan in changed:
+            self.deleteTimelineGroup(self.groupNameForWallKind(wallPlan.wallKind))
+        self.wallBodiesMap.update(self.findExistingWallBodies())
+
+        for wallPlan in changed:
+            startIndex = self.timelineIndex()
+            self.createWall(wallPlan.wallKind, self.wallData[wallPlan.wallKind])
+            self.groupTimeline(startIndex, self.groupNameForWallKind(wallPlan.wallKind))
+            self.setStoredWallHash(wallPlan.wallKind, hashes[wallPlan.wallKind])
         
-        # cut left and right inner walls that punch through to outer
-        self.tComponent.cutBodiesWithBodies(\
-            [self.wallBodiesMap[WallKind.frontOuter], self.wallBodiesMap[WallKind.backOuter]],\
-            [self.wallBodiesMap[WallKind.leftInner], self.wallBodiesMap[WallKind.rightInner]])
-        self.tComponent.cutBodiesWithBodies(\
-            [self.wallBodiesMap[WallKind.bottomOuter]],\
-            [self.wallBodiesMap[WallKind.leftInner], self.wallBodiesMap[WallKind.rightInner], \
-                self.wallBodiesMap[WallKind.frontInner], self.wallBodiesMap[WallKind.backInner]])
+        # one combine per target, with every inner wall that punches through it as tools
+        startIndex = self.timelineIndex()
+        cuts = [(self.wallBodiesMap[combine.target], [self.wallBodiesMap[tool] for tool in combine.tools]) for combine in self.plan.combines]
+        self.tComponent.cutBodiesWithPlan(cuts)
+        self.groupTimeline(startIndex, self.combineGroupName)
         self.tComponent.component.isConstructionFolderLightBulbOn = False
 
+    combineGroupName = "MoldCombines"
+
+    def wallInputHash(self, wallKind:WallKind) -> str:
+        tFace = self.faceMap[wallKind]
+        box = tFace.boundingBox
+        faceGeometry = box.minPoint.asArray() + box.maxPoint.asArray() + (tFace.area,)
+        params = {"wallThickness":self.wallThicknessVal, "slotLength":self.slotLengthVal, "slotSpacing":self.slotSpaceVal}
+        if wallKind.isTopBottom() and wallKind.isOuter():
+            params["lipWidth"] = self.lipWidthVal
+        return MoldPlan.wallInputHash(wallKind, self.wallData[wallKind], list(faceGeometry), params)
+
+    def getStoredWallHash(self, wallKind:WallKind) -> str:
+        attr = self.component.attributes.itemByName("TurtleWallHash", self.nameForWallKind(wallKind))
+        return attr.value if attr else None
+
+    def setStoredWallHash(self, wallKind:WallKind, wallHash:str):
+        self.component.attributes.add("TurtleWallHash", self.nameForWallKind(wallKind), wallHash)
+
+    def findExistingWallBodies(self) -> dict:
+        result = {}
+        for body in self.component.bRepBodies:
+            attr = body.attributes.itemByName("Turtle", "wallKind")
+            if attr:
+                result[WallKind(int(attr.value))] = body
+        return result
+
+    def deleteWallBodies(self):
+        for body in [body for body in self.component.bRepBodies if body.attributes.itemByName("Turtle", "wallKind")]:
+            body.deleteMe()
+        self.wallBodiesMap.clear()
+
+    def groupNameForWallKind(self, wallKind:WallKind) -> str:
+        return "Mold_" + self.nameForWallKind(wallKind)
+
+    def timelineIndex(self) -> int:
+        return TurtleUtils.activeDesign().timeline.markerPosition
+
+    def groupTimeline(self, startIndex:int, name:str):
+        # direct modeling designs have no timeline, walls are then always rebuilt
+        timeline = TurtleUtils.activeDesign().timeline
+        if TurtleUtils.activeDesign().designType != f.DesignTypes.ParametricDesignType or timeline.markerPosition <= startIndex:
+            return
+        group = timeline.timelineGroups.add(startIndex, timeline.markerPosition - 1)
+        group.name = name
+
+    def findTimelineGroup(self, name:str) -> f.TimelineGroup:
+        if TurtleUtils.activeDesign().designType != f.DesignTypes.ParametricDesignType:
+            return None
+        return next((group for group in TurtleUtils.activeDesign().timeline.timelineGroups if group.name == name), None)
+
+    def deleteTimelineGroup(self, name:str):
+        group = self.findTimelineGroup(name)
+        if group:
+            group.deleteMe(True)
+
+    def createPreviewWalls(self):
+        # temporary bodies straight from the layout, the parametric walls are only built on execute
+        self.clearPreview()
+        self.setLayoutData()
+        for kind, counts in self.wallSlotCounts().items():
+            self.layout.layoutWall(kind, counts)
+        plan = MoldPlan.createFromWallData(self.wallData, self.getSlotSketchForSlotKind)
+        self.preview = MoldPreview.create(self.component, self.layout, plan, self.faceMap)
+
+    def clearPreview(self):
+        if self.preview:
+            self.preview.clear()
+            self.preview = None
+
     def createWall(self, wallKind, wallData):
         wallDesc = zip(wallData[::2], wallData[1::2])
         isFeature = False
@@ -159,11 +301,13 @@ class MoldBuilder(TurtleCustomCommand):
                 isFeature = True
         self.wallBodiesMap[wallKind] = wall.mainBody
         wall.mainBody.name = self.nameForWallKind(wallKind) + "Body"
+        wall.mainBody.attributes.add("Turtle", "wallKind", str(wallKind.value))
 
         if not wallKind.isTopBottom():
             midplane = self.getParallelMidplane(wallKind)
             mirrored = self.tComponent.mirrorFeaturesWithPlane(midplane, wall.baseFeature.bodies)
             mirrored.bodies[0].name = self.nameForWallKind(wallKind.oppositeWall()) + "Body"
+            mirrored.bodies[0].attributes.add("Turtle", "wallKind", str(wallKind.oppositeWall().value))
             self.wallBodiesMap[wallKind.oppositeWall()] = mirrored.bodies[0]
 
     def nameForWallKind(self, wallKind:WallKind)->str:
@@ -229,10 +373,11 @@ class MoldBuilder(TurtleCustomCommand):
 
 
     def setParameters(self):
-        self.parameters.setOrCreateParam(self.wallThicknessExpr, self.diagMoldWallThickness.expression)
-        self.parameters.setOrCreateParam('lipWidth', self.diagLipThickness.expression)
-        self.parameters.setOrCreateParam('slotLength', self.diagSlotLength.expression)
-        self.parameters.setOrCreateParam('slotSpacing', self.diagSlotSpacing.expression)
+        self.parameters.setParams({
+            self.wallThicknessExpr:self.diagMoldWallThickness.expression,
+            'lipWidth':self.diagLipThickness.expression,
+            'slotLength':self.diagSlotLength.expression,
+            'slotSpacing':self.diagSlotSpacing.expression})
 
         self.wallThicknessVal = self.parameters.getParamValueOrDefault(self.wallThicknessExpr, 1.0)
         self.lipWidthVal = self.parameters.getParamValueOrDefault('lipWidth', 1.0)
@@ -274,48 +419,49 @@ class MoldBuilder(TurtleCustomCommand):
 
             slotSpacingParam = self.parameters.addOrGetParam('slotSpacing', str(estSpaceLen) + ' mm')
             self.diagSlotSpacing = inputs.addDistanceValueCommandInput('txSlotSpacing', 'Slot Spacing', self.parameters.createValue(slotSpacingParam.expression))
-            
+
+            # approximate walls while the dialog is open, the full walls are built on OK
+            self.diagFastPreview = inputs.addBoolValueInput('bFastPreview', 'Fast Preview', True, '', True)
+
             # self.reverseSelection = inputs.addBoolValueInput('bReverse', 'Reverse', True)
             # self.mirrorSelection = inputs.addBoolValueInput('bMirror', 'Mirror', True)
         except:
             print('Failed:\n{}'.format(traceback.format_exc()))
             
+    # per body (entityToken, revisionId): face index and surface kind per face attribute, and the shell thickness
+    _faceCache:dict[tuple[str,str], tuple[dict[str, tuple[int, SurfaceKind]], float, str]] = {}
+
     def _parseFaces(self):
-        allFaces:list[f.BRepFace] = []
-        self.body = self.component.bRepBodies.item(0)
         self.tFaces = []
         for face in self.body.faces:
            self.tFaces.append(TurtleFace.createWithFace(face))
 
-        allFaces = self.tFaces.copy()
-        self.topOuterFace = next(tface for tface in allFaces if tface.loops.count == 2)
-        allFaces.remove(self.topOuterFace)
-
-        # the normal points into the material, not out of it.
-        self.topNorm = self.topOuterFace.normal
-        self.bottomNorm = TurtleUtils.reverseVector(self.topNorm)
-        if abs(self.topNorm.z) > 0.1:
-            self.rightNorm = core.Vector3D.create(1,0,0)
-            self.backNorm = core.Vector3D.create(0,1,0) 
-        elif abs(self.topNorm.x) > 0.1:
-            self.rightNorm = core.Vector3D.create(0, self.topNorm.x, 0)
-            self.backNorm = core.Vector3D.create(0, 0 ,self.topNorm.x) 
-        else: # y
-            self.rightNorm = core.Vector3D.create(0, 0, self.topNorm.y)
-            self.backNorm = core.Vector3D.create(self.topNorm.y, 0, 0) 
-        self.leftNorm = TurtleUtils.reverseVector(self.rightNorm)
-        self.frontNorm = TurtleUtils.reverseVector(self.backNorm)
-
-        self.bottomInnerFace:TurtleFace = self.faceWithNormalMatch(self.topNorm, allFaces, False, SurfaceKind.bottomInner)
-        self.bottomOuterFace:TurtleFace = self.faceWithNormalMatch(self.bottomNorm, allFaces, False, SurfaceKind.bottomOuter)
-        self.frontOuterFace:TurtleFace = self.faceWithNormalMatch(self.frontNorm, allFaces, True, SurfaceKind.frontOuter)
-        self.backOuterFace:TurtleFace = self.faceWithNormalMatch(self.backNorm, allFaces, True, SurfaceKind.backOuter)
-        self.frontInnerFace:TurtleFace = self.faceWithNormalMatch(self.backNorm, allFaces, False, SurfaceKind.frontInner)
-        self.backInnerFace:TurtleFace = self.faceWithNormalMatch(self.frontNorm, allFaces, False, SurfaceKind.backInner)
-        self.leftOuterFace:TurtleFace = self.faceWithNormalMatch(self.leftNorm, allFaces, True, SurfaceKind.leftOuter)
-        self.rightOuterFace:TurtleFace = self.faceWithNormalMatch(self.rightNorm, allFaces, True, SurfaceKind.rightOuter)
-        self.leftInnerFace:TurtleFace = self.faceWithNormalMatch(self.rightNorm, allFaces, False, SurfaceKind.leftInner)
-        self.rightInnerFace:TurtleFace = self.faceWithNormalMatch(self.leftNorm, allFaces, False, SurfaceKind.rightInner)
+        cacheKey = (self.body.entityToken, self.body.revisionId)
+        cached = MoldBuilder._faceCache.get(cacheKey)
+        if cached:
+            for name, (index, surfaceKind) in cached[0].items():
+                tface = self.tFaces[index]
+                tface.surfaceKind = surfaceKind
+                setattr(self, name, tface)
+        else:
+            self.topOuterFace = next(tface for tface in self.tFaces if tface.loops.count == 2)
+        self._setNormals()
+
+        if not cached:
+            # one pass to bucket by normal, each lookup below is then only against faces facing that way
+            allFaces = self.tFaces.copy()
+            allFaces.remove(self.topOuterFace)
+            buckets = TurtleFace.bucketByNormal(allFaces)
+            self.bottomInnerFace:TurtleFace = self.faceWithNormalMatch(self.topNorm, buckets, False, SurfaceKind.bottomInner)
+            self.bottomOuterFace:TurtleFace = self.faceWithNormalMatch(self.bottomNorm, buckets, False, SurfaceKind.bottomOuter)
+            self.frontOuterFace:TurtleFace = self.faceWithNormalMatch(self.frontNorm, buckets, True, SurfaceKind.frontOuter)
+            self.backOuterFace:TurtleFace = self.faceWithNormalMatch(self.backNorm, buckets, True, SurfaceKind.backOuter)
+            self.frontInnerFace:TurtleFace = self.faceWithNormalMatch(self.backNorm, buckets, False, SurfaceKind.frontInner)
+            self.backInnerFace:TurtleFace = self.faceWithNormalMatch(self.frontNorm, buckets, False, SurfaceKind.backInner)
+            self.leftOuterFace:TurtleFace = self.faceWithNormalMatch(self.leftNorm, buckets, True, SurfaceKind.leftOuter)
+            self.rightOuterFace:TurtleFace = self.faceWithNormalMatch(self.rightNorm, buckets, True, SurfaceKind.rightOuter)
+            self.leftInnerFace:TurtleFace = self.faceWithNormalMatch(self.rightNorm, buckets, False, SurfaceKind.leftInner)
+            self.rightInnerFace:TurtleFace = self.faceWithNormalMatch(self.leftNorm, buckets, False, SurfaceKind.rightInner)
 
         self.faceMap = {
             WallKind.topOuter:self.topOuterFace,
@@ -331,7 +477,10 @@ class MoldBuilder(TurtleCustomCommand):
             WallKind.rightInner:self.rightInnerFace
         }
 
-        if self.component.features.shellFeatures.count == 1:
+        if cached:
+            self.shellThicknessVal = cached[1]
+            self.shellThicknessExpr = cached[2]
+        elif self.component.features.shellFeatures.count == 1:
             shellFeature = self.component.features.shellFeatures.item(0)
             self.shellThicknessVal = shellFeature.insideThickness.value
             self.shellThicknessExpr = shellFeature.insideThickness.expression
@@ -343,6 +492,12 @@ class MoldBuilder(TurtleCustomCommand):
             self.shellThicknessVal = dist.value
             self.shellThicknessExpr = f'{dist.value} cm'
         
+        if not cached:
+            faceNames = ["topOuterFace", "bottomInnerFace", "bottomOuterFace", "frontOuterFace", "backOuterFace", "frontInnerFace",\
+                "backInnerFace", "leftOuterFace", "rightOuterFace", "leftInnerFace", "rightInnerFace"]
+            faceIndexes = {name:(self.tFaces.index(getattr(self, name)), getattr(self, name).surfaceKind) for name in faceNames}
+            MoldBuilder._faceCache[cacheKey] = (faceIndexes, self.shellThicknessVal, self.shellThicknessExpr)
+
         self.parameters.setOrCreateParam('shellThickness', self.shellThicknessExpr)
 
         #topLengths = self.topOuterFace.xyzLengths
@@ -360,8 +515,27 @@ class MoldBuilder(TurtleCustomCommand):
         self.innerHeight = frontLengths[2]
         self.innerDepth = sideLengths[1]
 
+    def _setNormals(self):
+        # the normal points into the material, not out of it.
+        self.topNorm = self.topOuterFace.normal
+        self.bottomNorm = TurtleUtils.reverseVector(self.topNorm)
+        if abs(self.topNorm.z) > 0.1:
+            self.rightNorm = core.Vector3D.create(1,0,0)
+            self.backNorm = core.Vector3D.create(0,1,0) 
+        elif abs(self.topNorm.x) > 0.1:
+            self.rightNorm = core.Vector3D.create(0, self.topNorm.x, 0)
+            self.backNorm = core.Vector3D.create(0, 0 ,self.topNorm.x) 
+        else: # y
+            self.rightNorm = core.Vector3D.create(0, 0, self.topNorm.y)
+            self.backNorm = core.Vector3D.create(self.topNorm.y, 0, 0) 
+        self.leftNorm = TurtleUtils.reverseVector(self.rightNorm)
+        self.frontNorm = TurtleUtils.reverseVector(self.backNorm)
+
             
-    def faceWithNormalMatch(self, norm:core.Vector3D, tfaces:list[TurtleFace], findLargest:bool, surfaceKind:SurfaceKind) -> TurtleFace:
+    def faceWithNormalMatch(self, norm:core.Vector3D, tfaces, findLargest:bool, surfaceKind:SurfaceKind) -> TurtleFace:
+        # tfaces is a face list, or faces bucketed by TurtleFace.bucketByNormal
+        if isinstance(tfaces, dict):
+            tfaces = tfaces.get(TurtleFace.quantizeVector(norm), [])
         result:TurtleFace = None
         area = 0
         for tface in tfaces:
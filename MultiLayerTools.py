@@ -6,9 +6,13 @@ from .ExtrudeLayers import ExtrudeLayersCommand
 from .SketchBuilder import SketchBuilder
 from .MoldBuilder import MoldBuilder
 from .tlib.CreateShelves import CreateShelves
+from .tlib.TurtleClipboard import TurtleClipboard
+from .tlib.TurtleParams import TurtleParams
 
 commandHandles = []
 def run(context):
+    TurtleClipboard.start()
+    TurtleParams.start()
     commandHandles.append(MoldBuilder())
     commandHandles.append(CopySketchCommand())
     commandHandles.append(PasteSketchCommand())
@@ -23,3 +27,5 @@ def stop(context):
         except:
             print(cmd)
     commandHandles.clear()
+    TurtleClipboard.stop()
+    TurtleParams.stop()
@@ -1,18 +1,23 @@
 #Author-Robin Debreuil
 #Description-'Pastes sketch curves, constraints, parameters and dimesions. Optionally choose a guideline to allow transformed pasting if a guideline was selected while copying.'
 
-import adsk.core, adsk.fusion, traceback
+import os, adsk.core, adsk.fusion, traceback
 from .tlib.TurtleUtils import TurtleUtils
 from .tlib.TurtleUICommand import TurtleUICommand
 from .tlib.TurtleSketch import TurtleSketch
 from .tlib.TurtleDecoder import TurtleDecoder
 from .tlib.data.SketchData import *
+from .tlib.data.SketchLibrary import SketchLibrary
+from .tlib.data.SketchDataBundle import SketchDataBundle
 
 f:adsk.fusion
 core:adsk.core
 f,core,app,ui = TurtleUtils.initGlobals()
 
 class PasteSketchCommand(TurtleUICommand):
+    libraryFolder = "" # remembered for the session
+    libraryListLimit = 100
+
     def __init__(self):
         cmdId = 'ddwPasteSketchId'
         cmdName = 'Paste Sketch'
@@ -69,6 +74,22 @@ class PasteSketchCommand(TurtleUICommand):
             loadGroup = inputs.addGroupCommandInput("loadGroup", "Load From Disk")
             self.btLoadText = loadGroup.children.addButtonRowCommandInput("btLoadText", "Load Sketch", False)
             self.btLoadText.listItems.add('Load Sketch', False, 'resources/ddwCopySketchId')
+            # a loaded .tsks bundle lists its sketches here
+            self.bundleFile = ""
+            self.bundleList = loadGroup.children.addDropDownCommandInput('ddBundle', 'Bundle Sketch', core.DropDownStyles.TextListDropDownStyle)
+            self.bundleList.isVisible = False
+
+            # browse an indexed folder of sketches
+            self.library = None
+            self.libraryMatches = []
+            self.libraryImage = None
+            self.btLibrary = loadGroup.children.addButtonRowCommandInput("btLibrary", "Sketch Library", False)
+            self.btLibrary.listItems.add('Choose Library Folder', False, 'resources/ddwCopySketchId')
+            self.librarySearch = loadGroup.children.addStringValueInput('txLibrarySearch', 'Search', '')
+            self.libraryList = loadGroup.children.addDropDownCommandInput('ddLibrary', 'Sketches', core.DropDownStyles.TextListDropDownStyle)
+            if PasteSketchCommand.libraryFolder and os.path.isdir(PasteSketchCommand.libraryFolder):
+                self._openLibrary(PasteSketchCommand.libraryFolder)
+            self._updateLibraryUI()
 
             # use a separate tab for profiles, this almost solves the multiple kinds of selections issues
             tabProfiles = topLevelInputs.addTabCommandInput('tabProfiles', 'Inspect Profiles')
@@ -131,10 +152,37 @@ class PasteSketchCommand(TurtleUICommand):
                 else:
                     filename = self._loadSketch()
                     if filename != "":
-                        self.data = SketchData.createFromFile(filename)
+                        self._updateBundleList(filename)
+                        self.data = SketchData.createFromBundle(filename, 0) if self.bundleFile else SketchData.createFromFile(filename)
                         # textData = SketchData.loadData(filename)
                         # self.data = eval(textData)
                     self.btLoadText.listItems.clear()
+
+            elif cmdInput.id == 'ddBundle':
+                item = self.bundleList.selectedItem
+                if item and self.bundleFile:
+                    self.data = SketchData.createFromBundle(self.bundleFile, item.index)
+
+            elif cmdInput.id == 'btLibrary':
+                if len(self.btLibrary.listItems) == 0: # same re-enable hack as the load button
+                    self.btLibrary.listItems.add('Choose Library Folder', False, 'resources/ddwCopySketchId')
+                else:
+                    folder = self._chooseLibraryFolder()
+                    if folder != "":
+                        self._openLibrary(folder)
+                    self.btLibrary.listItems.clear()
+                self._updateLibraryUI()
+
+            elif cmdInput.id == 'txLibrarySearch':
+                self._updateLibraryList()
+
+            elif cmdInput.id == 'ddLibrary':
+                item = self.libraryList.selectedItem
+                if item and item.index < len(self.libraryMatches):
+                    entry = self.libraryMatches[item.index]
+                    self._updateBundleList("")
+                    self.data = SketchData.createFromFile(self.library.pathFor(entry))
+                    self._updateLibraryImage(entry)
             
             self._resetUI()
                 
@@ -202,7 +250,9 @@ class PasteSketchCommand(TurtleUICommand):
             radioItems.clear()
             if self.decoder and len(self.decoder.namedProfiles) > 0: 
                 for i, name in enumerate(self.decoder.namedProfiles):
-                    item = radioItems.add(name, i == self.selectedProfileIndex, 'resources/Profile/16x24.png')
+                    confidence = self.decoder.namedProfileConfidence.get(name, 1.0)
+                    label = name if confidence >= 0.5 else name + " (?)" # profiles may not have matched cleanly
+                    item = radioItems.add(label, i == self.selectedProfileIndex, 'resources/Profile/16x24.png')
 
     def _ensureSketchData(self):
         if not self.data:
@@ -238,12 +288,65 @@ class PasteSketchCommand(TurtleUICommand):
             else:
                 self.sketchSelection.clearSelection()
 
+    def _updateBundleList(self, filename:str):
+        # names come from the bundle's tables, no sketch is decoded until it's chosen
+        listItems = self.bundleList.listItems
+        listItems.clear()
+        self.bundleFile = filename if filename and SketchDataBundle.isBundleFile(filename) else ""
+        if self.bundleFile:
+            for i, name in enumerate(SketchDataBundle.createFromFile(self.bundleFile).names):
+                listItems.add(name, i == 0)
+        self.bundleList.isVisible = self.bundleFile != ""
+
+    def _openLibrary(self, folder:str):
+        # the index is refreshed incrementally, only new or modified sketches are read
+        self.library = SketchLibrary.forDirectory(folder)
+        PasteSketchCommand.libraryFolder = folder
+        self._updateLibraryList()
+
+    def _updateLibraryUI(self):
+        hasLibrary = self.library is not None
+        self.librarySearch.isVisible = hasLibrary
+        self.libraryList.isVisible = hasLibrary
+        if self.libraryImage:
+            self.libraryImage.isVisible = hasLibrary and self.libraryImage.isVisible
+
+    def _updateLibraryList(self):
+        listItems = self.libraryList.listItems
+        listItems.clear()
+        self.libraryMatches = self.library.search(self.librarySearch.value, self.libraryListLimit) if self.library else []
+        for entry in self.libraryMatches:
+            listItems.add(entry["name"] + " (" + str(entry["curveCount"]) + " curves)", False)
+        self._updateLibraryImage(None)
+
+    def _updateLibraryImage(self, entry:dict):
+        thumbnail = self.library.thumbnailFor(entry) if self.library and entry else None
+        if thumbnail:
+            if self.libraryImage:
+                self.libraryImage.imageFile = thumbnail
+            else:
+                self.libraryImage = self.btLibrary.parentCommandInput.children.addImageCommandInput('imgLibrary', 'Preview', thumbnail)
+            self.libraryImage.isVisible = True
+        elif self.libraryImage:
+            self.libraryImage.isVisible = False
+
+    def _chooseLibraryFolder(self):
+        result = ""
+        folderDialog = ui.createFolderDialog()
+        folderDialog.title = "Sketch Library Folder"
+        if PasteSketchCommand.libraryFolder:
+            folderDialog.initialDirectory = PasteSketchCommand.libraryFolder
+        dialogResult = folderDialog.showDialog()
+        if dialogResult == core.DialogResults.DialogOK:
+            result = folderDialog.folder
+        return result
+
     def _loadSketch(self):
         result = ""
         fileDialog = ui.createFileDialog()
         fileDialog.isMultiSelectEnabled = False
         fileDialog.title = "Load Sketch"
-        fileDialog.filter = 'Turtle Sketch Files (*.tsk)'
+        fileDialog.filter = 'Turtle Sketch Files (*.tsk);;Turtle Binary Sketch Files (*.tskb);;Turtle Sketch Bundles (*.tsks)'
         fileDialog.filterIndex = 0
         dialogResult = fileDialog.showOpen()
         if dialogResult == core.DialogResults.DialogOK:
@@ -0,0 +1,156 @@
+import math
+
+class WallLayout:
+    # One wall in its own face coordinates: u runs along the wall's primary axis, v along the secondary axis.
+    # Rectangles are flat [u0, v0, u1, v1] floats, slot lists hold consecutive rectangles.
+    def __init__(self, kind:int, width:float, height:float, boundary:list[float]):
+        self.kind = kind
+        self.width = width
+        self.height = height
+        self.boundary = boundary
+        self.slotCounts:list[int] = []     # per edge pair, in cross/outward order
+        self.slots:list[list[float]] = []  # per edge pair, rectangles on both edges of the pair
+
+    @property
+    def allSlots(self) -> list[float]:
+        return [v for slots in self.slots for v in slots]
+
+class MoldLayout:
+    # Slot and wall layout math for the mold, no Fusion API calls. Takes the box sizes and parameter values
+    # and returns every wall's boundary and slot rectangles, so sizes can be tried without rebuilding the mold.
+    # Wall kinds are WallKind values: tens digit is the wall (1 top, 2 bottom, 3 front, 4 back, 5 left, 6 right, 7 hole),
+    # ones digit is 0 inner, 1 center, 2 outer.
+
+    def __init__(self, outerSize:tuple[float,float,float], innerSize:tuple[float,float,float],\
+            wallThickness:float, slotLength:float, slotSpacing:float):
+        self.outerSize = outerSize # width (x), depth (y), height (z)
+        self.innerSize = innerSize
+        self.wallThickness = wallThickness
+        self.slotLength = slotLength
+        self.slotSpacing = slotSpacing
+        self.walls:dict[int, WallLayout] = {}
+
+    @classmethod
+    def create(cls, outerSize:tuple[float,float,float], innerSize:tuple[float,float,float],\
+            wallThickness:float, slotLength:float, slotSpacing:float):
+        # walls are added with layoutWall once their slot counts are known
+        return cls(outerSize, innerSize, wallThickness, slotLength, slotSpacing)
+
+    @property
+    def slotTotalLen(self) -> float:
+        return self.slotLength + self.slotSpacing
+
+    @property
+    def slotCounts(self) -> dict[str, int]:
+        ow, od, oh = self.outerSize
+        iw, idp, ih = self.innerSize
+        count = lambda length, isInner: self.calcSlotCount(length, self.wallThickness, self.slotTotalLen, isInner)
+        return {
+            "innerWidth":count(iw, True), "innerDepth":count(idp, True), "innerHeight":count(ih, True),
+            "outerWidth":count(ow, False), "outerDepth":count(od, False), "outerHeight":count(oh, False)}
+
+    def layoutWall(self, kind:int, slotCounts:list[int]) -> WallLayout:
+        width, height = self.wallSize(kind, self.outerSize, self.innerSize)
+        edges, isNeg = self.edgesToOffset(kind)
+        boundary = self.offsetRect([0.0, 0.0, width, height], edges, -self.wallThickness if isNeg else self.wallThickness)
+        result = WallLayout(kind, width, height, boundary)
+        for index, count in enumerate(slotCounts):
+            isCross = index % 2 == 0
+            result.slotCounts.append(count)
+            result.slots.append(self.edgePairSlots(boundary, isCross, count, self.slotLength, self.slotSpacing, self.wallThickness))
+        self.walls[kind] = result
+        return result
+
+    @classmethod
+    def calcSlotCount(cls, length:float, wallThickness:float, slotTotalLen:float, isInner:bool = True) -> int:
+        thickness = wallThickness * 2
+        reservedLen = thickness * 2 if isInner else thickness
+        return max(1, int((length - reservedLen) / slotTotalLen))
+
+    @classmethod
+    def wallSize(cls, kind:int, outerSize:tuple[float,float,float], innerSize:tuple[float,float,float]) -> tuple[float, float]:
+        # (u, v) size of the wall face, u along the primary axis
+        width, depth, height = innerSize if cls.isInner(kind) else outerSize
+        if cls.isLeftRight(kind):
+            return (depth, height)
+        if cls.isFrontBack(kind):
+            return (width, height)
+        return (width, depth)
+
+    @classmethod
+    def edgesToOffset(cls, kind:int) -> tuple[list[int], bool]: # cw from bottom left
+        result = []
+        isNeg = False
+        if cls.isTopBottom(kind):
+            isNeg = False
+            result = [] if cls.isInner(kind) else [0,1,2,3] # expand all lid, none for floor
+        elif cls.isLeftRight(kind):
+            isNeg = True
+            result = [0,2,3] if cls.isInner(kind) else [] # contract sides, and floor line if inner
+        elif cls.isFrontBack(kind):
+            isNeg = True
+            result = [3] if cls.isInner(kind) else [0,2] # contract floor line if inner
+        elif cls.isHole(kind):
+            isNeg = True
+            result = [0,1,2,3] # expand all the top hole edges inward to make room for slot holes on wall line
+        return (result, isNeg)
+
+    @classmethod
+    def offsetRect(cls, rect:list[float], edges:list[int], distance:float) -> list[float]:
+        # edges cw from bottom left: 0 left, 1 top, 2 right, 3 bottom. Positive distance moves the edge outward.
+        u0, v0, u1, v1 = rect
+        if 0 in edges:
+            u0 -= distance
+        if 1 in edges:
+            v1 += distance
+        if 2 in edges:
+            u1 += distance
+        if 3 in edges:
+            v0 -= distance
+        return [u0, v0, u1, v1]
+
+    @classmethod
+    def centeredSlotOffsets(cls, lineLen:float, slotLength:float, slotSpacing:float, count:int = -1) -> list[float]:
+        # start distance of each slot along a line, slots centered on it. TurtleSketch's tab points use this too.
+        tabTotalLen = slotSpacing + slotLength
+        slotCount = math.floor((lineLen - slotSpacing) / tabTotalLen) if count < 0 else count
+        first = cls.firstSlotOffset(lineLen, slotLength, slotSpacing, slotCount)
+        return [first + i * tabTotalLen for i in range(slotCount)]
+
+    @classmethod
+    def firstSlotOffset(cls, lineLen:float, slotLength:float, slotSpacing:float, count:int = -1) -> float:
+        # start distance of the first of count centered slots, the others follow every slotLength + slotSpacing
+        tabTotalLen = slotSpacing + slotLength
+        slotCount = math.floor((lineLen - slotSpacing) / tabTotalLen) if count < 0 else count
+        return (lineLen - (slotCount * tabTotalLen + slotSpacing)) / 2.0 + slotSpacing
+
+    @classmethod
+    def edgePairSlots(cls, boundary:list[float], isCross:bool, count:int, slotLength:float, slotSpacing:float, depth:float) -> list[float]:
+        # cross slots sit on the top and bottom edges (along u), outward slots on the left and right edges (along v)
+        u0, v0, u1, v1 = boundary
+        result = []
+        if isCross:
+            for start in cls.centeredSlotOffsets(u1 - u0, slotLength, slotSpacing, count):
+                result += [u0 + start, v0, u0 + start + slotLength, v0 + depth]
+                result += [u0 + start, v1 - depth, u0 + start + slotLength, v1]
+        else:
+            for start in cls.centeredSlotOffsets(v1 - v0, slotLength, slotSpacing, count):
+                result += [u0, v0 + start, u0 + depth, v0 + start + slotLength]
+                result += [u1 - depth, v0 + start, u1, v0 + start + slotLength]
+        return result
+
+    @classmethod
+    def isTopBottom(cls, kind:int) -> bool:
+        return kind > 0 and kind < 30
+    @classmethod
+    def isFrontBack(cls, kind:int) -> bool:
+        return kind >= 30 and kind < 50
+    @classmethod
+    def isLeftRight(cls, kind:int) -> bool:
+        return kind >= 50 and kind < 70
+    @classmethod
+    def isHole(cls, kind:int) -> bool:
+        return kind >= 70 and kind < 80
+    @classmethod
+    def isInner(cls, kind:int) -> bool:
+        return kind % 10 == 0
@@ -0,0 +1,95 @@
+import hashlib
+from .WallData import WallKind
+from .data.SketchData import Sketches
+
+class SlotPlacement:
+    # slots along one edge pair of a wall
+    def __init__(self, wallKind:WallKind, isCross:bool, sketchKinds:list[Sketches], slotCount:int, mirrorInvert:bool):
+        self.wallKind = wallKind
+        self.isCross = isCross
+        self.sketchKinds = sketchKinds
+        self.slotCount = slotCount
+        self.mirrorInvert = mirrorInvert
+
+class WallPlan:
+    def __init__(self, wallKind:WallKind, edgePairs:list[tuple[SlotPlacement, SlotPlacement]]):
+        self.wallKind = wallKind
+        self.edgePairs = edgePairs
+        self.mirroredWallKind = None if wallKind.isTopBottom() else wallKind.oppositeWall()
+
+class CombinePlan:
+    def __init__(self, target:WallKind, tools:list[WallKind]):
+        self.target = target
+        self.tools = tools
+
+class MoldPlan:
+    # The walls to build and the punch through cuts between them, as plain data worked out before any features
+    # are created. MoldBuilder and MoldPreview both build from it, the walls themselves come from wallData.
+
+    # walls that lock through another wall, left and right punch through to outer walls
+    punchThroughCuts = [
+        (WallKind.frontOuter, [WallKind.leftInner, WallKind.rightInner]),
+        (WallKind.backOuter, [WallKind.leftInner, WallKind.rightInner]),
+        (WallKind.bottomOuter, [WallKind.leftInner, WallKind.rightInner, WallKind.frontInner, WallKind.backInner]),
+    ]
+
+    def __init__(self):
+        self.walls:list[WallPlan] = []
+        self.combines:list[CombinePlan] = []
+
+    @classmethod
+    def createFromWallData(cls, wallData:dict, sketchForSlotKind, wallKinds:list[WallKind] = None):
+        # wallData is MoldBuilder's table of WallKind -> [[slotKind(s), count, mirrorInvert?], ...] in cross/outward pairs
+        # sketchForSlotKind maps a SlotKind to the Sketches drawing used for it
+        result = cls()
+        for wallKind in (wallKinds if wallKinds is not None else wallData):
+            edges = wallData[wallKind]
+            pairs = []
+            for crossEdge, outwardEdge in zip(edges[::2], edges[1::2]):
+                pairs.append((cls._createPlacement(wallKind, crossEdge, True, sketchForSlotKind),\
+                    cls._createPlacement(wallKind, outwardEdge, False, sketchForSlotKind)))
+            result.walls.append(WallPlan(wallKind, pairs))
+
+        builtKinds = set(result.builtWallKinds)
+        for target, tools in cls.punchThroughCuts:
+            presentTools = [tool for tool in tools if tool in builtKinds]
+            if target in builtKinds and presentTools:
+                result.combines.append(CombinePlan(target, presentTools))
+        return result
+
+    @classmethod
+    def _createPlacement(cls, wallKind:WallKind, edgeData:list, isCross:bool, sketchForSlotKind) -> SlotPlacement:
+        slotKinds = edgeData[0] if isinstance(edgeData[0], list) else [edgeData[0]]
+        sketchKinds = [sketchForSlotKind(slotKind) for slotKind in slotKinds]
+        mirrorInvert = edgeData[2] if len(edgeData) > 2 else False
+        return SlotPlacement(wallKind, isCross, sketchKinds, edgeData[1], mirrorInvert)
+
+    @property
+    def builtWallKinds(self) -> list[WallKind]:
+        # walls that exist once the plan is built, including the mirrored opposite walls
+        result = []
+        for wallPlan in self.walls:
+            result.append(wallPlan.wallKind)
+            if wallPlan.mirroredWallKind:
+                result.append(wallPlan.mirroredWallKind)
+        return result
+
+    @classmethod
+    def wallInputHash(cls, wallKind:WallKind, edges:list, faceGeometry:list[float], paramValues:dict[str, float]) -> str:
+        # content hash of everything a wall is built from, walls with an unchanged hash don't need rebuilding
+        # edges is the wall's wallData entry, faceGeometry any floats describing the face (bounds, area)
+        parts = [str(wallKind.value)]
+        for edge in edges:
+            slotKinds = edge[0] if isinstance(edge[0], list) else [edge[0]]
+            parts.append(",".join(str(slotKind.value) for slotKind in slotKinds))
+            parts.append(str(edge[1]))
+            parts.append(str(bool(edge[2]) if len(edge) > 2 else False))
+        parts += [cls._hashFloat(value) for value in faceGeometry]
+        for name in sorted(paramValues):
+            parts.append(name + "=" + cls._hashFloat(paramValues[name]))
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _hashFloat(cls, value:float) -> str:
+        # rounded so evaluation noise in the face geometry doesn't count as a change
+        return "{:.6f}".format(round(float(value), 6) + 0.0)
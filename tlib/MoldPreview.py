@@ -0,0 +1,118 @@
+import adsk.core, adsk.fusion, traceback
+
+from .TurtleUtils import TurtleUtils
+from .TurtleFace import TurtleFace
+from .TurtleAppearance import TurtleAppearance
+from .MoldLayout import MoldLayout, WallLayout
+from .MoldPlan import MoldPlan, WallPlan
+from .WallData import WallKind
+from .data.SketchData import Sketches
+
+f:adsk.fusion
+core:adsk.core
+f,core,app,ui = TurtleUtils.initGlobals()
+
+class MoldPreview:
+    # Approximate mold walls for the command preview. Each wall is a temporary box on its face with the slot
+    # rectangles from the MoldLayout cut out (holes) or added as tabs (fingers), shown as custom graphics.
+    # No sketches or features are created, so this stays fast no matter how many slots there are.
+
+    def __init__(self, component:f.Component, layout:MoldLayout, plan:MoldPlan, faceMap:dict[WallKind, TurtleFace]):
+        self.component = component
+        self.layout = layout
+        self.plan = plan
+        self.faceMap = faceMap
+        self.tempBRep = f.TemporaryBRepManager.get()
+        self.appearances = TurtleAppearance.instance()
+        self.bodies:dict[WallKind, f.BRepBody] = {}
+        self.graphicsGroup:f.CustomGraphicsGroup = None
+
+    @classmethod
+    def create(cls, component:f.Component, layout:MoldLayout, plan:MoldPlan, faceMap:dict[WallKind, TurtleFace]):
+        result = cls(component, layout, plan, faceMap)
+        result.run()
+        return result
+
+    def run(self):
+        for wallPlan in self.plan.walls:
+            wallLayout = self.layout.walls[wallPlan.wallKind.value]
+            self.bodies[wallPlan.wallKind] = self.createWallBody(wallPlan.wallKind, wallLayout, wallPlan)
+            if wallPlan.mirroredWallKind and wallPlan.mirroredWallKind in self.faceMap:
+                self.bodies[wallPlan.mirroredWallKind] = self.createWallBody(wallPlan.mirroredWallKind, wallLayout, wallPlan)
+
+        for combine in self.plan.combines:
+            target = self.bodies.get(combine.target)
+            for tool in combine.tools:
+                if target and tool in self.bodies:
+                    self.tempBRep.booleanOperation(target, self.tempBRep.copy(self.bodies[tool]), f.BooleanTypes.DifferenceBooleanType)
+        self.show()
+
+    def createWallBody(self, wallKind:WallKind, wallLayout:WallLayout, wallPlan:WallPlan) -> f.BRepBody:
+        tFace = self.faceMap[wallKind]
+        thickness = self.layout.wallThickness
+        result = self.createBox(tFace, wallKind, wallLayout.boundary, thickness)
+        for pair in wallPlan.edgePairs:
+            for placement in pair:
+                if not placement.sketchKinds or placement.slotCount < 1:
+                    continue
+                op = Sketches.normalOperationForDrawing(placement.sketchKinds[0])
+                if op == f.FeatureOperations.JoinFeatureOperation:
+                    # fingers stick out past the boundary edge
+                    slots = MoldLayout.edgePairSlots(wallLayout.boundary, placement.isCross, placement.slotCount,\
+                        self.layout.slotLength, self.layout.slotSpacing, -thickness)
+                    boolType = f.BooleanTypes.UnionBooleanType
+                elif op == f.FeatureOperations.CutFeatureOperation:
+                    slots = MoldLayout.edgePairSlots(wallLayout.boundary, placement.isCross, placement.slotCount,\
+                        self.layout.slotLength, self.layout.slotSpacing, thickness)
+                    boolType = f.BooleanTypes.DifferenceBooleanType
+                else:
+                    continue
+                for i in range(0, len(slots), 4):
+                    slotBox = self.createBox(tFace, wallKind, slots[i:i + 4], thickness)
+                    self.tempBRep.booleanOperation(result, slotBox, boolType)
+        return result
+
+    def createBox(self, tFace:TurtleFace, wallKind:WallKind, rect:list[float], thickness:float) -> f.BRepBody:
+        # rect is in wall (u, v) coordinates from the face's bounding box min corner, the box extends off the face along its normal
+        uAxis, vAxis, nAxis = self.wallAxes(wallKind)
+        minPt = tFace.boundingBox.minPoint.asArray()
+        (success, normal) = tFace.face.evaluator.getNormalAtPoint(tFace.face.pointOnFace)
+        nSign = 1 if not success or normal.asArray()[nAxis] >= 0 else -1
+
+        u0, u1 = sorted((rect[0], rect[2]))
+        v0, v1 = sorted((rect[1], rect[3]))
+        center = [0.0, 0.0, 0.0]
+        center[uAxis] = minPt[uAxis] + (u0 + u1) / 2.0
+        center[vAxis] = minPt[vAxis] + (v0 + v1) / 2.0
+        center[nAxis] = minPt[nAxis] + nSign * thickness / 2.0
+        lengthDir = [0.0, 0.0, 0.0]
+        lengthDir[uAxis] = 1.0
+        widthDir = [0.0, 0.0, 0.0]
+        widthDir[vAxis] = 1.0
+        box = core.OrientedBoundingBox3D.create(core.Point3D.create(*center), core.Vector3D.create(*lengthDir),\
+            core.Vector3D.create(*widthDir), u1 - u0, v1 - v0, thickness)
+        return self.tempBRep.createBox(box)
+
+    def wallAxes(self, wallKind:WallKind) -> tuple[int, int, int]:
+        # x, y, z index of the wall's primary, secondary and normal axis, matching TurtleWall.primaryAxis/secondaryAxis
+        if wallKind.isLeftRight():
+            return (1, 2, 0)
+        if wallKind.isFrontBack():
+            return (0, 2, 1)
+        return (0, 1, 2)
+
+    def show(self):
+        self.graphicsGroup = self.component.customGraphicsGroups.add()
+        for wallKind, body in self.bodies.items():
+            graphicsBody = self.graphicsGroup.addBRepBody(body)
+            appearance = self.appearances.getAppearanceByIndex(wallKind.colorIndex)
+            graphicsBody.color = f.CustomGraphicsAppearanceColorEffect.create(appearance)
+
+    def clear(self):
+        try:
+            if self.graphicsGroup and self.graphicsGroup.isValid:
+                self.graphicsGroup.deleteMe()
+        except:
+            print('Failed:\n{}'.format(traceback.format_exc()))
+        self.graphicsGroup = None
+        self.bodies.clear()
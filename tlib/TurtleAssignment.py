@@ -0,0 +1,123 @@
+import math
+
+try:
+    import numpy as np # optional, falls back to plain python when not installed
+except ImportError:
+    np = None
+
+class TurtleAssignment:
+    # One to one matching of two point sets by distance (used to remap profile centroids).
+    # Pairs that are each other's nearest point and within lockTolerance are taken directly,
+    # the rest are solved with the Hungarian method, so close or shuffled centroids can't steal each other's match.
+    lockTolerance = 0.0001
+
+    @classmethod
+    def assignPoints(cls, sources:list[tuple[float,float]], targets:list[tuple[float,float]], lockTolerance:float = None)\
+            -> tuple[list[int], list[float]]:
+        # returns (target index per source or -1, confidence per source from 0 to 1)
+        # confidence is how much closer the chosen target is than the next best one, unmatched sources are 0
+        lockTol = cls.lockTolerance if lockTolerance is None else lockTolerance
+        mapping = [-1] * len(sources)
+        if len(sources) == 0 or len(targets) == 0:
+            return (mapping, [0.0] * len(sources))
+
+        distances = cls.distanceMatrix(sources, targets)
+        nearestTarget = [min(range(len(targets)), key=row.__getitem__) for row in distances]
+        nearestSource = [min(range(len(sources)), key=lambda i: distances[i][j]) for j in range(len(targets))]
+        for i, j in enumerate(nearestTarget):
+            if nearestSource[j] == i and distances[i][j] <= lockTol:
+                mapping[i] = j
+
+        openRows = [i for i in range(len(sources)) if mapping[i] == -1]
+        lockedCols = set(mapping)
+        openCols = [j for j in range(len(targets)) if j not in lockedCols]
+        if openRows and openCols:
+            subMapping = cls.solve([[distances[i][j] for j in openCols] for i in openRows])
+            for row, col in enumerate(subMapping):
+                if col >= 0:
+                    mapping[openRows[row]] = openCols[col]
+
+        confidences = []
+        for i, j in enumerate(mapping):
+            if j < 0:
+                confidences.append(0.0)
+                continue
+            dist = distances[i][j]
+            nextBest = min((d for k, d in enumerate(distances[i]) if k != j), default=math.inf)
+            if nextBest == math.inf or dist == 0:
+                confidences.append(1.0)
+            else:
+                confidences.append(max(0.0, 1.0 - dist / nextBest))
+        return (mapping, confidences)
+
+    @classmethod
+    def distanceMatrix(cls, sources:list[tuple[float,float]], targets:list[tuple[float,float]]) -> list[list[float]]:
+        if np is not None:
+            a = np.asarray(sources, dtype=np.float64)[:, None, 0:2]
+            b = np.asarray(targets, dtype=np.float64)[None, :, 0:2]
+            return np.sqrt(((a - b) ** 2).sum(axis=2)).tolist()
+        return [[math.hypot(sx - tx, sy - ty) for (tx, ty) in targets] for (sx, sy) in sources]
+
+    @classmethod
+    def solve(cls, costs:list[list[float]]) -> list[int]:
+        # minimum cost assignment (Hungarian method, shortest augmenting path form), column per row or -1.
+        # Rectangular input is fine, the smaller side is fully assigned.
+        rowCount = len(costs)
+        if rowCount == 0:
+            return []
+        colCount = len(costs[0])
+        if colCount == 0:
+            return [-1] * rowCount
+        if rowCount > colCount:
+            transposed = [[costs[i][j] for i in range(rowCount)] for j in range(colCount)]
+            result = [-1] * rowCount
+            for col, row in enumerate(cls.solve(transposed)):
+                if row >= 0:
+                    result[row] = col
+            return result
+
+        # 1 based, column 0 is the virtual start
+        u = [0.0] * (rowCount + 1)
+        v = [0.0] * (colCount + 1)
+        rowOfCol = [0] * (colCount + 1)
+        way = [0] * (colCount + 1)
+        for i in range(1, rowCount + 1):
+            rowOfCol[0] = i
+            j0 = 0
+            minv = [math.inf] * (colCount + 1)
+            used = [False] * (colCount + 1)
+            while True:
+                used[j0] = True
+                i0 = rowOfCol[j0]
+                row = costs[i0 - 1]
+                ui0 = u[i0]
+                delta = math.inf
+                j1 = 0
+                for j in range(1, colCount + 1):
+                    if not used[j]:
+                        cur = row[j - 1] - ui0 - v[j]
+                        if cur < minv[j]:
+                            minv[j] = cur
+                            way[j] = j0
+                        if minv[j] < delta:
+                            delta = minv[j]
+                            j1 = j
+                for j in range(colCount + 1):
+                    if used[j]:
+                        u[rowOfCol[j]] += delta
+                        v[j] -= delta
+                    else:
+                        minv[j] -= delta
+                j0 = j1
+                if rowOfCol[j0] == 0:
+                    break
+            while j0:
+                j1 = way[j0]
+                rowOfCol[j0] = rowOfCol[j1]
+                j0 = j1
+
+        result = [-1] * rowCount
+        for j in range(1, colCount + 1):
+            if rowOfCol[j]:
+                result[rowOfCol[j] - 1] = j - 1
+        return result
@@ -0,0 +1,125 @@
+import os, tempfile, hashlib, traceback
+
+try:
+    import tkinter as tk # clipboard access in Fusion, not available in every python build
+except ImportError:
+    tk = None
+
+class TkClipboardBackend:
+    # one hidden Tk root for the life of the add-in, creating a root per call costs hundreds of milliseconds
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+
+    def getText(self) -> str:
+        result = ""
+        try:
+            self.root.update() # this clipboard is quite flakey, without this text can be on the clipboard but not detected
+            result = self.root.clipboard_get()
+        except tk.TclError:
+            print(traceback.format_exc())
+        return result
+
+    def setText(self, data:str):
+        self.root.clipboard_clear()
+        self.root.clipboard_append(data)
+        self.root.update() # now it stays on the clipboard
+
+    def clear(self):
+        self.root.clipboard_clear()
+        self.root.update()
+
+    def close(self):
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass
+        self.root = None
+
+class FileClipboardBackend:
+    # clipboard stand in that shares text through a file, for machines without Tk
+    def __init__(self, path:str = None):
+        self.path = path if path else os.path.join(tempfile.gettempdir(), "TurtleClipboard.txt")
+
+    def getText(self) -> str:
+        if not os.path.exists(self.path):
+            return ""
+        with open(self.path, "r") as file:
+            return file.read()
+
+    def setText(self, data:str):
+        with open(self.path, "w") as file:
+            file.write(data)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        pass
+
+class MemoryClipboardBackend:
+    def __init__(self, text:str = ""):
+        self.text = text
+
+    def getText(self) -> str:
+        return self.text
+
+    def setText(self, data:str):
+        self.text = data
+
+    def clear(self):
+        self.text = ""
+
+    def close(self):
+        pass
+
+class TurtleClipboard:
+    # Long lived clipboard service, started in the add-in's run() and stopped in stop().
+    # The backend is Tk when available, otherwise a file, and can be swapped (eg. for a MemoryClipboardBackend).
+    _instance = None
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @classmethod
+    def start(cls, backend = None):
+        cls.stop()
+        cls._instance = TurtleClipboard(backend if backend else cls.createDefaultBackend())
+        return cls._instance
+
+    @classmethod
+    def stop(cls):
+        if cls._instance:
+            try:
+                cls._instance.backend.close()
+            except:
+                print('Failed:\n{}'.format(traceback.format_exc()))
+            cls._instance = None
+
+    @classmethod
+    def instance(cls):
+        # started on first use if run() didn't
+        return cls._instance if cls._instance else cls.start()
+
+    @classmethod
+    def createDefaultBackend(cls):
+        if tk is not None:
+            try:
+                return TkClipboardBackend()
+            except tk.TclError:
+                print(traceback.format_exc())
+        return FileClipboardBackend()
+
+    @classmethod
+    def contentHash(cls, text:str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def getText(self) -> str:
+        return self.backend.getText()
+
+    def setText(self, data:str):
+        self.backend.setText(data)
+
+    def clear(self):
+        self.backend.clear()
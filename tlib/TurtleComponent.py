@@ -143,19 +143,27 @@ class TurtleComponent:
         return ((sorted[0], sorted[1]), isNeg)
 
 
-    def extrude(self, profile, start, expression, isFlipped = False) -> f.ExtrudeFeature:
+    def extrude(self, profile, start, expression, isFlipped = False, operation:f.FeatureOperations = None, participantBodies = None,\
+            startOffset:str = None) -> f.ExtrudeFeature:
+        # start is a face or plane to extrude from, startOffset an expression offset from the profile plane (used when start is None)
         if profile is None:
             return
         profile = profile if isinstance(profile, f.Profile) else TurtleUtils.ensureObjectCollection(profile)
         extrudes = self.component.features.extrudeFeatures
         dist = self.parameters.createValue(expression)
-        extrudeInput = extrudes.createInput(profile, f.FeatureOperations.NewBodyFeatureOperation) 
+        op = operation if operation is not None else f.FeatureOperations.NewBodyFeatureOperation
+        extrudeInput = extrudes.createInput(profile, op) 
+        if participantBodies and op != f.FeatureOperations.NewBodyFeatureOperation:
+            # set up front, changing the operation afterwards costs two timeline rolls per feature
+            extrudeInput.participantBodies = TurtleUtils.ensureList(participantBodies)
         extentDistance = f.DistanceExtentDefinition.create(dist) 
         direction = f.ExtentDirections.NegativeExtentDirection if isFlipped else f.ExtentDirections.PositiveExtentDirection
         extrudeInput.setOneSideExtent(extentDistance, direction)
         if start:
             startFrom = f.FromEntityStartDefinition.create(start, self.parameters.createValue(0))
             extrudeInput.startExtent = startFrom
+        elif startOffset:
+            extrudeInput.startExtent = f.OffsetStartDefinition.create(self.parameters.createValue(startOffset))
         extruded = extrudes.add(extrudeInput) 
         return extruded
 
@@ -166,18 +174,20 @@ class TurtleComponent:
         self.colorExtrudedBodiesByIndex(newFeatures,colorIndex)
         return newFeatures
 
-    def extrudeOuterProfile(self, tsketch:TurtleSketch, expression:str, colorIndex:int)->f.Feature:
+    def extrudeOuterProfile(self, tsketch:TurtleSketch, expression:str, colorIndex:int, operation:f.FeatureOperations = None, participantBodies = None)->f.Feature:
         from .TurtleLayers import TurtleLayers
         profile = tsketch.findOuterProfile()
-        newFeatures = self.extrude(profile, None, expression)
-        self.colorExtrudedBodiesByIndex(newFeatures,colorIndex)
+        newFeatures = self.extrude(profile, None, expression, False, operation, participantBodies)
+        if operation is None or operation == f.FeatureOperations.NewBodyFeatureOperation:
+            self.colorExtrudedBodiesByIndex(newFeatures,colorIndex)
         return newFeatures
 
-    def extrudeAllButOuterProfile(self, tsketch:TurtleSketch, expression:str, colorIndex:int)->f.Feature:
+    def extrudeAllButOuterProfile(self, tsketch:TurtleSketch, expression:str, colorIndex:int, operation:f.FeatureOperations = None, participantBodies = None)->f.Feature:
         from .TurtleLayers import TurtleLayers
         profile = tsketch.allButOuterProfile()
-        newFeatures = self.extrude(profile, None, expression)
-        self.colorExtrudedBodiesByIndex(newFeatures,colorIndex)
+        newFeatures = self.extrude(profile, None, expression, False, operation, participantBodies)
+        if operation is None or operation == f.FeatureOperations.NewBodyFeatureOperation:
+            self.colorExtrudedBodiesByIndex(newFeatures,colorIndex)
         return newFeatures
 
     def extrudeAllProfiles(self, tsketch:TurtleSketch, expression:str, colorIndex:int)->f.Feature:
@@ -188,16 +198,33 @@ class TurtleComponent:
         return newFeatures
 
     def cutBodiesWithBodies(self, targets:list[f.BRepBody], tools:list[f.BRepBody], keepTools = True)-> list[f.CombineFeature]:
+        return self.cutBodiesWithPlan([(target, tools) for target in targets], keepTools)
+
+    def cutBodiesWithPlan(self, cuts:list[tuple[f.BRepBody, list[f.BRepBody]]], keepTools = True)-> list[f.CombineFeature]:
+        # one combine per target with all of its tools in a single collection, repeated targets are merged
         result = []
-        toolCollection = TurtleUtils.ensureObjectCollection(tools)
         features = self.component.features.combineFeatures
-        for target in targets:
-            input = features.createInput(target, toolCollection)
+        for target, tools in self.groupCombines(cuts):
+            input = features.createInput(target, TurtleUtils.ensureObjectCollection(tools))
             input.isKeepToolBodies = keepTools
             input.operation = f.FeatureOperations.CutFeatureOperation
             result.append(features.add(input))
         return result
 
+    @classmethod
+    def groupCombines(cls, cuts:list[tuple[f.BRepBody, list[f.BRepBody]]]) -> list[tuple[f.BRepBody, list[f.BRepBody]]]:
+        # merges entries with the same target and drops repeated tools, keeping first seen order
+        # keyed by entityToken, so it's one dict lookup per body rather than a search of the entries so far
+        groups:dict[str, tuple[f.BRepBody, dict[str, f.BRepBody]]] = {}
+        for target, tools in cuts:
+            targetKey = target.entityToken
+            entry = groups.setdefault(targetKey, (target, {}))
+            for tool in tools:
+                toolKey = tool.entityToken
+                if toolKey != targetKey:
+                    entry[1].setdefault(toolKey, tool)
+        return [(target, list(tools.values())) for target, tools in groups.values() if tools]
+
     def cutComponent(self, profile):
         bodies = self.getBodies()
         for body in bodies:
@@ -9,12 +9,29 @@ from .data.SketchData import *
 #from .data.SketchData import Sketches
 from .TurtleParams import TurtleParams
 from .TurtlePath import TurtlePath
+from .TurtleExpressionScanner import TurtleExpressionScanner
+from .TurtlePointTransform import TurtlePointTransform
+from .TurtleSpatialIndex import TurtleSpatialIndex
+from .TurtleAssignment import TurtleAssignment
+from .data.SketchDataCompiler import SketchDataCompiler, CompiledParam, CompiledCurve, CompiledRecord
 from modulefinder import Module
 
 f:adsk.fusion
 core:adsk.core
 f,core,app,ui = TurtleUtils.initGlobals()
 
+class DecodedStamp:
+    # entities created by one placement of the sketch data
+    def __init__(self, sketchPoints:list[f.SketchPoint], curves:list[f.SketchCurve], pointChains:list[list[f.SketchPoint]],\
+            dimensions:list[f.SketchDimension], profileMap:list[int], namedProfiles:dict[str, list[int]]):
+        self.sketchPoints = sketchPoints
+        self.curves = curves
+        self.pointChains = pointChains
+        self.dimensions = dimensions
+        self.profileMap = profileMap
+        self.namedProfiles = namedProfiles
+        self.namedProfileConfidence:dict[str, float] = {}
+
 class TurtleDecoder:
 
     def __init__(self, data:SketchData, sketch:f.Sketch, reverse:bool = False, mirror:bool = False):
@@ -37,7 +54,11 @@ class TurtleDecoder:
         self.encGuideFlipped = False
         
         self.addedDimensions:list[f.SketchDimension] = None
-        self.dimensionNameMap:list = None
+        self.dimensionScanner:TurtleExpressionScanner = None
+        self.resolvedParams:set[str] = set() # user params already added or found, shared by all stamps
+        self.stamps:list[DecodedStamp] = []
+        self.namedProfiles:dict[str, list[int]] = {}
+        self.namedProfileConfidence:dict[str, float] = {} # 0 to 1 per named profile, from the centroid match margins
 
         self.data = data
 
@@ -50,25 +71,31 @@ class TurtleDecoder:
     @classmethod
     def createWithGuidelines(cls, data:SketchData, guidelines:list[f.SketchLine], reverse = False, mirror = False, callback = None):
         decoder = TurtleDecoder(data, None, reverse, mirror)
+        # each sketch solves once after all its stamps are placed
+        sketches = []
         for guideline in guidelines:
-            decoder.sketch = guideline.parentSketch
-            decoder.tSketch = TurtleSketch.createWithSketch(guideline.parentSketch)
-            decoder.userGuideline = guideline
-            decoder.userStartGuidePoint = guideline.startSketchPoint.geometry
-            decoder.userEndGuidePoint = guideline.endSketchPoint.geometry
-            decoder.run()
-            if callback:
-                callback(decoder)
+            if guideline.parentSketch not in sketches:
+                sketches.append(guideline.parentSketch)
+        deferredStates = [sketch.isComputeDeferred for sketch in sketches]
+        try:
+            for sketch in sketches:
+                sketch.isComputeDeferred = True
+            for guideline in guidelines:
+                decoder.tSketch = TurtleSketch.createWithSketch(guideline.parentSketch)
+                decoder.userGuideline = guideline
+                decoder.userStartGuidePoint = guideline.startSketchPoint.geometry
+                decoder.userEndGuidePoint = guideline.endSketchPoint.geometry
+                decoder.stamp()
+                if callback:
+                    callback(decoder)
+        finally:
+            for sketch, wasDeferred in zip(sketches, deferredStates):
+                sketch.isComputeDeferred = wasDeferred
         return decoder
     @classmethod
     def createWithPointChain(cls, data:SketchData, sketch:f.Sketch, pointsList:list[tuple[core.Point3D, core.Point3D]], reverse = False, mirror = False, callback = None):
         decoder = TurtleDecoder(data, sketch, reverse, mirror)
-        for ptPair in pointsList:
-            decoder.userStartGuidePoint = ptPair[0]
-            decoder.userEndGuidePoint = ptPair[1]
-            decoder.run()
-            if callback:
-                callback(decoder)
+        decoder.runBatch(pointsList, callback)
         return decoder
     @classmethod
     def createWithPoints(cls, data:SketchData, sketch:f.Sketch, points:tuple[core.Point3D, core.Point3D], reverse = False, mirror = False, callback = None):
@@ -80,10 +107,34 @@ class TurtleDecoder:
 
     def run(self):
         self.sketch.isComputeDeferred = True
+        self.stamp()
+        self.sketch.isComputeDeferred = False
+
+    def runBatch(self, pointsList:list[tuple[core.Point3D, core.Point3D]], callback = None) -> list[DecodedStamp]:
+        # places the data once per guide point pair inside a single deferred compute, so the sketch solves once
+        wasDeferred = self.sketch.isComputeDeferred
+        self.sketch.isComputeDeferred = True
+        result = []
+        try:
+            for ptPair in pointsList:
+                self.userStartGuidePoint = ptPair[0]
+                self.userEndGuidePoint = ptPair[1]
+                result.append(self.stamp())
+                if callback:
+                    callback(self)
+        finally:
+            self.sketch.isComputeDeferred = wasDeferred
+        return result
+
+    def stamp(self) -> DecodedStamp:
+        # one placement, compute deferral is left to the caller
         self.transform.setToIdentity()
         self.assessTransform()
         self.decodeFromSketch()
-        self.sketch.isComputeDeferred = False
+        result = DecodedStamp(self.sketchPoints, self.curves, self.pointChains, self.addedDimensions, self.profileMap, self.namedProfiles)
+        result.namedProfileConfidence = self.namedProfileConfidence
+        self.stamps.append(result)
+        return result
         
     def assessTransform(self):
         if self.data.hasEncodedGuideline:
@@ -107,28 +158,36 @@ class TurtleDecoder:
     def decodeFromSketch(self):
         self.offsetRefs = {}
         self.forwardExpressions = {}
+        self.failedDimensions = set() # dimension indexes that couldn't be created, params using them are dropped
         self.addedDimensions = []
-        self.dimensionNameMap = []
+        # built before params are added so params that reference dimensions are deferred as forward refs
+        self.dimensionScanner = TurtleExpressionScanner.createForDimensionIndexes(len(self.data.dimensionValues))
 
         self.sketchPoints = self.generatePoints(self.data.pointValues)
-        self.curves = self.generateChains(self.data.chainValues)
-        self.constraints = self.generateConstraints(self.data.constraintValues)
+        # compiled once per SketchData, repeat decodes skip the string parsing
+        self.curves = self.generateChains(self.data.compiledChains)
+        self.constraints = self.generateConstraints(self.data.compiledConstraints)
         for name in self.data.params:
             self.addUserParam(name)
-        self.generateDimensions(self.data.dimensionValues) # added to self.addedDimensions
+        self.generateDimensions(self.data.compiledDimensions) # added to self.addedDimensions
         self.profileMap = self.mapProfiles(self.data.profileCentroids)
     
     def addUserParam(self, name, currentDimIndex:int = -1):
         forwardRefs = []
-        encoding = self.parseDParam(self.data.params[name], forwardRefs)
-        if(len(forwardRefs) > 0):
+        encoding = self.scanExpression(self.data.compiledParams[name], forwardRefs)
+        failedRefs = [ref for ref in forwardRefs if ref in self.failedDimensions]
+        if len(failedRefs) > 0:
+            print("Parameter " + name + " not added, it uses dimension(s) that could not be created: " +\
+                ", ".join("__" + str(ref) for ref in failedRefs))
+        elif(len(forwardRefs) > 0):
             lastRef:int = forwardRefs[-1]
             if lastRef in self.forwardExpressions:
                 self.forwardExpressions[lastRef].append(name)  
             else:
                 self.forwardExpressions[lastRef] = [name]
-        else:
+        elif name not in self.resolvedParams:
             self.parameters.addOrGetParam(name, encoding)
+            self.resolvedParams.add(name)
 
     def createTransformFromGuidePoints(self, enc0:core.Point3D, enc1:core.Point3D, guide0:core.Point3D, guide1:core.Point3D):
             reverseVal = -1 if self.isReversed else 1
@@ -165,58 +224,54 @@ class TurtleDecoder:
 
         
     def parsePoint(self, pointVal:list[float]) -> tuple[core.Point3D, bool]:
-        isFixed = False
-        if len(pointVal) > 2 and pointVal[2] == 'f':
-            isFixed = True
-            pointVal.pop()
-        pt = self.asTransformedPoint3D(pointVal)
+        # the 'f' flag is read, not popped, so the data stays intact for the next stamp
+        isFixed = len(pointVal) > 2 and pointVal[2] == 'f'
+        pt = self.asTransformedPoint3D([pointVal[0], pointVal[1]])
         return (pt, isFixed)
 
     def generatePoints(self, ptVals, startIndex:int = 0, count:int = -1) -> list[f.SketchPoint]:
         (origin, xAxis, yAxis, zAxis) = self.transform.getAsCoordinateSystem()
         self.hasRotation = xAxis.y != 0 or yAxis.x!= 0
 
+        if count > 0:
+            ptVals = ptVals[:max(1, count - startIndex)]
+        # transform the whole block at once, then create the sketch points
+        transformed = TurtlePointTransform.transformPoints(self.transform.asArray(), ptVals)
+        sketchPoints = self.sketch.sketchPoints
+        createPoint = core.Point3D.create
+
         result = []
         idx = startIndex
-        for pv in ptVals:
-            isFixed = False
-            if len(pv) > 2 and pv[2] == 'f':
-                isFixed = True
-                pv.pop()
-                
-            pt = self.asTransformedPoint3D(pv)
+        for pv, tpt in zip(ptVals, transformed):
+            isFixed = len(pv) > 2 and pv[2] == 'f'
             if idx == 0 and pv[0] == 0 and pv[1] == 0:
-                result.append(self.sketch.sketchPoints.item(0))
+                result.append(sketchPoints.item(0))
             else:
-                result.append(self.sketch.sketchPoints.add(pt))
+                result.append(sketchPoints.add(createPoint(tpt[0], tpt[1], tpt[2])))
             result[-1].isFixed = isFixed
 
             if idx == self.encStartGuideIndex or idx == self.encEndGuideIndex:
                 result[-1].isFixed = True
                 
             idx += 1
-            if count > 0 and idx >= count:
-                break
         return result
     
-    def generateChains(self, chains):
+    def generateChains(self, chains:list[list[CompiledCurve]]):
         result = []
         self.pointChains = []
         sketchCurves = self.sketch.sketchCurves
-        self.generatedCurves = []
+        self.generatedCurves = TurtleSpatialIndex(tolerance=TurtlePath.tolerance) # auto generated lines by start point
         for chain in chains:
-            segs = chain.split(" ")
             curPointChain = []
             self.pointChains.append(curPointChain)
-            for seg in segs:
+            for seg in chain:
                 try:
-                    # can't capture repeating groups with re, so max 4 params. Use pip regex to improve, but sticking with this for now. Could put it in a loop as well.
-                    parse = re.findall(r"([xX])([fF])([LACEOS])([pvase][0-9\[\]\.\-,|]*)([pvase][0-9\[\]\.\-,|]*)?([pvase][0-9\[\]\.\-,|]*)?([pvase][0-9\[\]\.\-,|]*)?", seg)[0]
-                    
-                    isConstruction = parse[0] == "x"
-                    isFixed = parse[1] == "f"
-                    kind = parse[2]
-                    params = self.parseParams(parse[3:])
+                    if seg.kind is None:
+                        raise ValueError("Unrecognized curve encoding")
+                    isConstruction = seg.isConstruction
+                    isFixed = seg.isFixed
+                    kind = seg.kind
+                    params = self.resolveParams(seg.params)
                     curve = None
                     if kind == "L":
                         curve = self.replaceLine(params[0], params[1]) # check for generated line match, add if present
@@ -233,8 +288,9 @@ class TurtleDecoder:
                         # merge auto generated guides and points with drawn ones, maybe do this in the encoder.
                         # note: the constraints will not be able to be reapplied, will result in warnings. Fix if too bothersome.
                         self.replacePoint(params[0], curve.centerSketchPoint)
-                        self.generatedCurves.append(curve.majorAxisLine)
-                        self.generatedCurves.append(curve.minorAxisLine)
+                        for axisLine in (curve.majorAxisLine, curve.minorAxisLine):
+                            start = axisLine.geometry.startPoint
+                            self.generatedCurves.insert(start.x, start.y, axisLine)
                     elif kind == "O":
                         # seems there is no add for conic curves yet?
                         #curve = sketchCurves.sketchConicCurves.add()
@@ -269,24 +325,29 @@ class TurtleDecoder:
                         if curve != self.userGuideline:
                              curve.attributes.add("Turtle", "generated", str(len(result) - 1))
                 except:
-                    print(seg + ' Curve Generation Failed:\n{}'.format(traceback.format_exc()))
+                    print(seg.text + ' Curve Generation Failed:\n{}'.format(traceback.format_exc()))
         return result
     
     def replaceLine(self, pt0, pt1):
         result = None
-        for line in self.generatedCurves:
+        if len(self.generatedCurves) == 0:
+            return result
+        for line in self.generatedCurves.query(pt0.geometry.x, pt0.geometry.y):
             if TurtlePath.isEquivalentLine(line, pt0, pt1):
                 result = line
                 self.replacePoint(pt0, line.startSketchPoint)
                 self.replacePoint(pt1, line.endSketchPoint)
                 break
-            elif TurtlePath.isEquivalentLine(line, pt1, pt0):
-                result = line
-                self.replacePoint(pt1, line.startSketchPoint)
-                self.replacePoint(pt0, line.endSketchPoint)
-                break
+        if not result:
+            for line in self.generatedCurves.query(pt1.geometry.x, pt1.geometry.y):
+                if TurtlePath.isEquivalentLine(line, pt1, pt0):
+                    result = line
+                    self.replacePoint(pt1, line.startSketchPoint)
+                    self.replacePoint(pt0, line.endSketchPoint)
+                    break
         if result:
-            self.generatedCurves.remove(result)
+            start = result.geometry.startPoint
+            self.generatedCurves.remove(start.x, start.y, result)
         return result
 
     def replacePoint(self, orgPoint, newPoint):
@@ -301,22 +362,21 @@ class TurtleDecoder:
             result = False
         return result
 
-    def generateConstraints(self, cons):
+    def generateConstraints(self, cons:list[CompiledRecord]):
+        # cons are already in draw order
         result = []
-        cons = self.sortConstraintsByDrawOrder(cons)
         constraints:f.GeometricConstraints = self.sketch.geometricConstraints
         index = 0
         unhandledConstraints = []
         for con in cons:
             constraint = None
-            parse = re.findall(r"(VH|PA|PE|EQ|CC|CL|CO|MI|OC|OF|SY|SM|TA)([pcav][0-9|\[\]\.\-,]*)([pcav][0-9|\[\]\.\-,]*)?([pcav][0-9|\[\]\.\-,]*)?", con)[0]
-
-            kind = parse[0]
-            params = self.parseParams(parse[1:])
-            p0 = params[0]
-            p1 = params[1] if len(params) > 1 else None
-            p2 = params[2] if len(params) > 2 else None
+            kind = con.kind
             try:
+                params = self.resolveParams(con.params)
+                p0 = params[0]
+                p1 = params[1] if len(params) > 1 else None
+                p2 = params[2] if len(params) > 2 else None
+
                 if(kind == "VH"):
                     if not self.hasRotation and not p0 == self.userGuideline: # don't set vert/horz if transforming with rotation
                         constraint = self.tSketch.makeLineHV(p0)
@@ -379,60 +439,50 @@ class TurtleDecoder:
                         print('Failed:\n{}'.format(traceback.format_exc()))
 
             except:
-                print("Unable to generate constraint: " + con)
-                unhandledConstraints.append(con)
+                print("Unable to generate constraint: " + con.text)
+                unhandledConstraints.append(con.text)
             index += 1
         return result
 
 
     def mapProfiles(self, profileCentroids):
-        if len(profileCentroids) != len(self.sketch.profiles):
-            return
         # map data centroids to current transform, preserve data indexes
         dataCentroids = self.pt = self.asTransformedPoint3Ds(profileCentroids)
-        # make indexed table of current sketch profile centroids
-        # map two tables based on distance diff of centroids
-        # adjust namedProfile indexes to reflect new sketch indexes. 
+        sketchCentroids = [profile.areaProperties().centroid for profile in self.sketch.profiles]
+        # optimal one to one match of data centroids to sketch profile centroids.
+        # If the counts differ the extra profiles on either side stay unmatched (-1).
         # Convert to entity IDs rather than indexes if final parm transforms are too disruptive (if helpful)
-        dataToSketchMap = [-1] * len(dataCentroids)
-        logMinDists = []
-        for sketchProfileIndex, profile in enumerate(self.sketch.profiles):
-            centroid = profile.areaProperties().centroid
-            minDist = 99999.0
-            mapIndex = 0
-            for i, dc in enumerate(dataCentroids):
-                if dc:
-                    dist = centroid.distanceTo(dc)
-                    if dist < minDist:
-                        mapIndex = i
-                        minDist = dist
-            dataToSketchMap[mapIndex] = sketchProfileIndex
-            dataCentroids[mapIndex] = None
-            logMinDists.append(minDist)
-        
+        dataToSketchMap, confidences = TurtleAssignment.assignPoints(\
+            [(c.x, c.y) for c in dataCentroids], [(c.x, c.y) for c in sketchCentroids])
+
+        # adjust namedProfile indexes to reflect new sketch indexes, confidence is that of the weakest match
         self.namedProfiles = {}
+        self.namedProfileConfidence = {}
         for key in self.data.namedProfiles:
             mappedIndexes = []
+            confidence = 1.0
             for index in self.data.namedProfiles[key]:
-                mappedIndexes.append(dataToSketchMap[index])
+                mapped = dataToSketchMap[index] if 0 <= index < len(dataToSketchMap) else -1
+                if mapped >= 0:
+                    mappedIndexes.append(mapped)
+                    confidence = min(confidence, confidences[index])
+                else:
+                    confidence = 0.0
             self.namedProfiles[key] = mappedIndexes
+            self.namedProfileConfidence[key] = confidence
 
         return dataToSketchMap
 
-    def generateDimensions(self, dims):
-        for idx in range(len(self.data.dimensionValues)):
-            regex = re.compile("(?<![a-zA-Z0-9_])__" + str(idx) + "(?![a-zA-Z0-9_])")
-            self.dimensionNameMap.append(regex)
-
+    def generateDimensions(self, dims:list[CompiledRecord]):
         dimensions:f.SketchDimensions = self.sketch.sketchDimensions
         idx = 0
         paramIndex = 0
         for dim in dims:
             dimension:f.SketchDimension = None
+            offsetParameter = None
             orientation = f.DimensionOrientations.AlignedDimensionOrientation
-            parse = re.findall(r"(SLD|SOD|SAD|SDD|SRD|SMA|SMI|SCC|SOC)([pcvo][^pcvod]*|d\[[^\]]*\])([pcvoe][^pcvoed]*|d\[[^\]]*\])?([pcvoe][^pcvoed]*|d\[[^\]]*\])?([pcvoe][^pcvoed]*|d\[[^\]]*\])?([pcvoe][^pcvoed]*|d\[[^\]]*\])?", dim)[0]
-            kind = parse[0]
-            params = self.parseParams(parse[1:])
+            kind = dim.kind
+            params = self.resolveParams(dim.params)
             p0 = params[0]
             p1 = params[1] if len(params) > 1 else None
             p2 = params[2] if len(params) > 2 else None
@@ -471,15 +521,22 @@ class TurtleDecoder:
                     dimension = dimensions.addConcentricCircleDimension(p0,p1,dimPt)#self.asTransformedPoint3D(p3))
                     dimension.parameter.expression = p2
                 elif kind == "SOC": # SketchOffsetCurvesDimension
-                    parameter = self.offsetRefs[p0]
-                    parameter.expression = p1
+                    offsetParameter = self.offsetRefs[p0]
+                    offsetParameter.expression = p1
                     
                 self.addedDimensions.append(dimension)
-                if idx in self.forwardExpressions:
-                    for name in self.forwardExpressions[idx]:
-                        self.addUserParam(name)
             except:
-                print(dim + ' Could not add dimension:\n{}'.format(traceback.format_exc()))
+                print(dim.text + ' Could not add dimension:\n{}'.format(traceback.format_exc()))
+
+            # params waiting on this dimension are added now, or dropped if there is no parameter to refer to
+            if dimension:
+                self.dimensionScanner.addRename("__" + str(idx), dimension.parameter.name)
+            elif offsetParameter:
+                self.dimensionScanner.addRename("__" + str(idx), offsetParameter.name)
+            else:
+                self.failedDimensions.add(idx)
+            for name in self.forwardExpressions.pop(idx, []):
+                self.addUserParam(name)
 
             idx += 1
 
@@ -497,10 +554,7 @@ class TurtleDecoder:
         return result
 
     def encodeExpression(self, expr):
-        result = expr
-        for regPair in self.dimensionNameMap.values():
-            result = regPair[0].sub(regPair[1], result)
-        return result
+        return self.dimensionScanner.scan(expr)
 
     def textPoint(self, p0, p1 = None):
         if p1 == None:
@@ -521,64 +575,50 @@ class TurtleDecoder:
         return int(val)
 
     def parseParams(self, params):
-        result = []
-        for param in params:
-            if not param == "":
-                result.append(self.parseParam(param))
-        return result
+        return self.resolveParams(SketchDataCompiler.compileParams(params))
 
     def parseParam(self, param):
+        return self.resolveParam(SketchDataCompiler.compileParam(param))
+
+    def resolveParams(self, params:list[CompiledParam]):
+        return [self.resolveParam(param) for param in params]
+
+    def resolveParam(self, param:CompiledParam):
         result = None
-        kind = param[0]
-        val = param[1:]
+        kind = param.kind
+        val = param.value
 
         if kind == "p": # point
-            result = self.sketchPoints[int(val)]
+            result = self.sketchPoints[val]
         elif kind == "c": # curve
-            result = self.curves[int(val)]
-        elif kind == "e": # enum
-            result = int(val)
-        elif kind == "v": # array of values
-            if val.startswith("["):
-                result = ast.literal_eval(val) # self.parseNums(val)
-            else:
-                result = val
-        elif kind == "d": # curve
-            result = self.parseDParam(val)
-        elif kind == "o": # object index (so far just used for tracking offset constraints)
-            result = int(val)
+            result = self.curves[val]
+        elif kind == "e" or kind == "o": # enum, object index
+            result = val
+        elif kind == "v": # array of values, copied as callers may extend it
+            result = list(val) if isinstance(val, tuple) else val
+        elif kind == "d": # expression
+            result = self.scanExpression(val)
         elif kind == "a": # list of curve indexes
-            result = []
-            idxs = val.split("|")
-            for idx in idxs:
-                result.append(self.curves[int(idx)])
+            result = [self.curves[idx] for idx in val]
         elif kind == "s": # list of point indexes (for splines)
-            result = []
-            idxs = val.split("|")
-            for idx in idxs:
-                result.append(self.sketchPoints[int(idx)])
+            result = [self.sketchPoints[idx] for idx in val]
         return result
 
-    def parseDParam(self, dParam:str,  forwardRefs = []):
-        firstD = dParam.index('[') + 1
-        result = dParam[firstD:-1] # strip the outsides of d[...] or [...]
-        validIndex = len(self.addedDimensions)
-        idx = 0
-        for regex in self.dimensionNameMap:
-            if regex.search(result):
-                if validIndex > idx:
-                    name = self.addedDimensions[idx].parameter.name
-                    result = regex.sub(name, result)
-                else:
-                    forwardRefs.append(idx)
-            idx += 1
+    def parseDParam(self, dParam:str,  forwardRefs = None):
+        return self.scanExpression(SketchDataCompiler.stripDParam(dParam), forwardRefs)
+
+    def scanExpression(self, expr:str, forwardRefs = None):
+        # __index refs to dimensions already added are renamed, the rest are reported as forward refs
+        found = set()
+        result = self.dimensionScanner.scan(expr, found)
+        if forwardRefs is not None:
+            forwardRefs.extend(sorted(found))
         return result
 
     def asTransformedPoint3Ds(self, pts):
-        result = []
-        for pt in pts:
-            result.append(self.asTransformedPoint3D(pt))
-        return result
+        createPoint = core.Point3D.create
+        transformed = TurtlePointTransform.transformPoints(self.transform.asArray(), pts)
+        return [createPoint(tpt[0], tpt[1], tpt[2]) for tpt in transformed]
 
     def asTransformedPoint3D(self, pts):
         if isinstance(pts, Iterable):
@@ -606,12 +646,3 @@ class TurtleDecoder:
                 maxLen = len(chain)
         return result
 
-    def sortConstraintsByDrawOrder(self, lst:list)->list:
-        result=sorted(lst, key=cmp_to_key(self.compareConstraints), reverse=False)
-        return result
-
-    def compareConstraints(self, c0:str, c1:str)->int:
-        order = ['CO', 'PE', 'VH', 'TA', 'EQ', 'PA', 'MI', 'SY', 'CL', 'CC', 'SM', 'OF']
-        pre0 = order.index(c0[:2])
-        pre1 = order.index(c1[:2])
-        return pre0 - pre1
@@ -1,11 +1,12 @@
 
 import adsk.core, adsk.fusion, adsk.cam, traceback
-import os, math, re, sys
+import os, math, re, sys, io
 from collections.abc import Iterable
 from .TurtleUtils import TurtleUtils
 from .TurtleSketch import TurtleSketch
 from .TurtleParams import TurtleParams
 from .TurtlePath import TurtlePath
+from .TurtleExpressionScanner import TurtleExpressionScanner
 
 f:adsk.fusion
 core:adsk.core
@@ -13,8 +14,12 @@ f,core,app,ui = TurtleUtils.initGlobals()
 
 
 class TurtleEncoder:
-    def __init__(self, sketch:f.Sketch = None, guideElement:f.SketchLine = None, namedProfiles = {}):
+    # Pass a writable file-like sink to stream the encoding there instead of to the clipboard.
+    # Pass params (from TurtleParams.getUserParams) when encoding several sketches to read the design's parameters once.
+    def __init__(self, sketch:f.Sketch = None, guideElement:f.SketchLine = None, namedProfiles = {}, sink = None, echo:bool = False, params:dict = None):
         
+        self.echo:bool = echo # print the full encoding to the console
+        self.encodedSketch:str = None
         self.guideElement:f.SketchLine = guideElement
         self.autoGuideElement = (sketch == None) # only autodetect guidelines if this isn't a UI command
         self.sketch:f.Sketch = sketch
@@ -27,39 +32,48 @@ class TurtleEncoder:
         self.points = {}
         self.pointKeys = []
         self.pointValues = []
+        self.pointIndexes = {} # entityToken -> index into pointValues
         self.curves = {}
         self.curveKeys = []
         self.curveValues = []
+        self.curveIndexes = {} # entityToken -> index into curveValues
         self.chains = []
         self.constraints = {}
+        self.constraintIndexes = {} # entityToken -> index into constraints (used by offset dimensions)
         self.dimensions = {}
         self.profiles = {}
         
         # python seems to not compare sys.float_info.min well
         self.bounds = [core.Point2D.create(float("inf"), float("inf")), core.Point2D.create(float("-inf"), float("-inf"))]
         self.offsetParams = []
+        self.userParams = params
 
         self.parseSketchData()
-        self.encodedSketch = self.encodeAll()
+        if sink is not None:
+            self.writeAll(sink)
+        else:
+            self.encodedSketch = self.encodeAll()
         TurtleUtils.selectEntity(self.sketch)
 
     def parseSketchData(self):
         os.system('cls')
         self.data = {}
 
-        tparams = TurtleParams.instance()
         self.usedParams = []
-        self.params = tparams.getUserParams()
+        self.params = self.userParams if self.userParams is not None else TurtleParams.instance().getUserParams()
+        self.paramOrder = {name:idx for idx, name in enumerate(self.params)}
 
         self.assessDimensionNames()
 
         self.parseAllPoints()
         self.pointKeys = list(self.points)
         self.pointValues = list(self.points.values())
+        self.pointIndexes = {token:idx for idx, token in enumerate(self.pointKeys)}
 
         self.chains = self.parseAllChains()
         self.curveKeys = list(self.curves)
         self.curveValues = list(self.curves.values())
+        self.curveIndexes = {token:idx for idx, token in enumerate(self.curveKeys)}
 
         self.parseAllConstraints()
         self.parseAllDimensions()
@@ -67,6 +81,18 @@ class TurtleEncoder:
 
 
     def encodeAll(self):
+        buffer = io.StringIO()
+        self.writeAll(buffer)
+        result = buffer.getvalue()
+
+        TurtleUtils.setClipboardText(result)
+        
+        if self.echo:
+            print(result)
+        print("\n\nSketch data is now on clipboard.")
+        return result
+
+    def writeAll(self, sink):
         # need to remove all unused points?
         self.data["Params"] = self.params
         self.data["Points"] = self.pointValues
@@ -75,51 +101,41 @@ class TurtleEncoder:
         self.data["Dimensions"] = self.dimensions.values()
         self.data["ProfileCentroids"] = self.profiles.values()
 
-        result = "{#Turtle Generated Data\n"
-        result += "\'CoordinateSystem\':" + self.encodeList(self.sketch.transform.asArray(), False, 4) + ",\n"
-        result += "\'Params\':{\n" + self.encodeParams() + "},\n"
-        result += "\'PointBounds\':[" + self.encodePoints(self.bounds[0], self.bounds[1]) + "],\n"
-        result += "\'Points\':[\n" + self.encodePoints(*self.data["Points"]) + "\n],\n"
-        result += "\'Chains\':[\n" + self.encodeChains(self.data["Chains"]) + "\n],\n"
+        write = sink.write
+        write("{#Turtle Generated Data\n")
+        write("\'CoordinateSystem\':" + self.encodeList(self.sketch.transform.asArray(), False, 4) + ",\n")
+        write("\'Params\':{\n" + self.encodeParams() + "},\n")
+        write("\'PointBounds\':[" + self.encodePoints(self.bounds[0], self.bounds[1]) + "],\n")
+        write("\'Points\':[\n" + self.encodePoints(*self.data["Points"]) + "\n],\n")
+        write("\'Chains\':[\n" + self.encodeChains(self.data["Chains"]) + "\n],\n")
         if len(self.data["Constraints"]) > 0:
-            result += "\'Constraints\':" + self.encodeList(self.data["Constraints"]) + ",\n" #               [\n\'" + "\',\'".join(self.data["Constraints"]) + "\'\n],\n")
+            write("\'Constraints\':" + self.encodeList(self.data["Constraints"]) + ",\n")
         if len(self.data["Dimensions"]) > 0:
-            result += "\'Dimensions\':" + self.encodeList(self.data["Dimensions"]) + ",\n" #             [\n\'" + "\',\'".join(self.data["Dimensions"]) + "\'\n],\n")
+            write("\'Dimensions\':" + self.encodeList(self.data["Dimensions"]) + ",\n")
         if self.guideElement:
             guideEntity = self.encodeEntity(self.guideElement)
             if isinstance(self.guideElement, f.SketchPoint):
                 gp0 = self.encodeEntity(self.guideElement)
-                result += "\'Guidepoint\':['" + gp0 + "',\'" + guideEntity + "\'],\n"
+                write("\'Guidepoint\':['" + gp0 + "',\'" + guideEntity + "\'],\n")
             else:
                 guidePoints = self.getSortedPoints(self.guideElement)
                 gp0 = self.encodeEntity(guidePoints[0])
                 gp1 = self.encodeEntity(guidePoints[1])
                 flippedText = "flip" if TurtleSketch.isLineFlipped(self.guideElement) else "noFlip"
-                result += "\'Guideline\':['" + gp0 +"','"+ gp1 + "',\'" + guideEntity + "\',\'" + flippedText + "\'],\n"
+                write("\'Guideline\':['" + gp0 +"','"+ gp1 + "',\'" + guideEntity + "\',\'" + flippedText + "\'],\n")
         else: 
-            result += "\'Guideline\':[],\n" 
+            write("\'Guideline\':[],\n")
 
-        result += "\'ProfileCentroids\':[\n" + self.encodePoints(*self.data["ProfileCentroids"]) + "\n],\n"
-        result += "\'NamedProfiles\':{\n" + self.encodeNamedProfiles() + "\n}\n"
+        write("\'ProfileCentroids\':[\n" + self.encodePoints(*self.data["ProfileCentroids"]) + "\n],\n")
+        write("\'NamedProfiles\':{\n" + self.encodeNamedProfiles() + "\n}\n")
 
-        result += "}\n\n"
-
-
-        TurtleUtils.setClipboardText(result)
-        
-        print(result)
-        print("\n\nSketch data is now on clipboard.")
-        return result
+        write("}\n\n")
 
     def assessDimensionNames(self):
-        self.dimensionNameMap = {}
         dimensions:f.SketchDimensions = self.sketch.sketchDimensions
-        idx = 0
-        for dim in dimensions:
-            name = dim.parameter.name
-            regex = re.compile("(?<![a-zA-Z0-9_])" + name + "(?![a-zA-Z0-9_])")
-            self.dimensionNameMap[name] = [regex, "__" + str(idx)]
-            idx += 1
+        dimensionNames = [dim.parameter.name for dim in dimensions]
+        # one scanner per encode, finds used params and rewrites dimension names to __index in a single pass
+        self.expressionScanner = TurtleExpressionScanner.createForDimensionNames(dimensionNames, self.params)
 
     def parseAllPoints(self):
         for point in self.sketch.sketchPoints:
@@ -136,7 +152,7 @@ class TurtleEncoder:
 
 
     def parseAllChains(self):
-        tokens = []
+        tokens = set()
         chains = []
         for line in self.sketch.sketchCurves:
             if not line.entityToken in tokens:
@@ -147,7 +163,10 @@ class TurtleEncoder:
         for con in self.sketch.geometricConstraints:
             econ = self.encodeConstraint(con)
             if econ != "":
-                self.constraints[con.entityToken] = econ
+                token = con.entityToken
+                if not token in self.constraintIndexes:
+                    self.constraintIndexes[token] = len(self.constraints)
+                self.constraints[token] = econ
 
     def parseAllDimensions(self):
         for dim in self.sketch.sketchDimensions:
@@ -161,13 +180,14 @@ class TurtleEncoder:
             if enc != "":
                 self.profiles[profile.entityToken] = enc
 
-    def appendConnectedCurves(self, baseLine:f.SketchLine, tokens:list):
+    def appendConnectedCurves(self, baseLine:f.SketchLine, tokens:set):
         connected = self.sketch.findConnectedCurves(baseLine)
         result = []
         for curve in connected:
-            self.curves[curve.entityToken] = curve
+            token = curve.entityToken
+            self.curves[token] = curve
             result.append(len(self.curves) - 1)
-            tokens.append(curve.entityToken)
+            tokens.add(token)
         return result
 
     def findConnectedCurves(self, baseLine:f.SketchLine):
@@ -178,7 +198,7 @@ class TurtleEncoder:
         return result
 
     def pointIndex(self, token):
-        return self.pointKeys.index(token)
+        return self.pointIndexes[token]
 
     def linePointIndexes(self, line:f.SketchLine):
         return [self.pointIndex(line.startSketchPoint.entityToken), self.pointIndex(line.endSketchPoint.entityToken)]
@@ -309,39 +329,40 @@ class TurtleEncoder:
         return centroid
 
     def encodeList(self, items, asStrings = True, lineStep = 5):
-        result = "[" if lineStep == 0 else "[\n"
+        result = ["[" if lineStep == 0 else "[\n"]
         quote = "\'" if asStrings else ""
         comma = ""
         idx = 0
         for item in items:
-            result += comma + quote + str(item) + quote
+            result.append(comma + quote + str(item) + quote)
             comma = ",\t"
             idx += 1
             if lineStep > 0 and idx % lineStep == 0:
                 comma = ", # " + str(idx - lineStep) + " - " + str(idx - 1) + "\n"
-        result += "]" if lineStep == 0 else "\n]"
-        return result
+        result.append("]" if lineStep == 0 else "\n]")
+        return "".join(result)
 
     def encodeParams(self):
-        result = ""
-        comma = ""
-        for key in self.usedParams:
-            result += "\'" + key + "\':\'" + self.encodeParameter(self.params[key]) + "\',\n"
-        return result
+        result = []
+        for key in self.usedParams: # encoding can append newly referenced params, they are picked up by this loop
+            result.append("\'" + key + "\':\'" + self.encodeParameter(self.params[key]) + "\',\n")
+        return "".join(result)
 
     def encodeParameter(self, expr:str):
-        result = expr
-        self.checkExpressionForUserParam(result)
-        # convert internal dimension references to __index format
-        for regPair in self.dimensionNameMap.values():
-            result = regPair[0].sub(regPair[1], result)
+        # convert internal dimension references to __index format, and note any user params used
+        found = set()
+        result = self.expressionScanner.scan(expr, found)
+        self.addUsedParams(found)
         return "d[" + result + "]"
 
     # check if expression contains a user variable
     def checkExpressionForUserParam(self, expr:str):
-        for pname in self.params:
-            match = re.search("(?<![a-zA-Z0-9_])" + pname + "(?![a-zA-Z0-9_])", expr)
-            if match and (not pname in self.usedParams):
+        self.addUsedParams(self.expressionScanner.findWatched(expr))
+
+    def addUsedParams(self, names:set):
+        # keep design parameter order so the encoded Params section is stable
+        for pname in sorted(names, key=self.paramOrder.get):
+            if not pname in self.usedParams:
                 self.usedParams.append(pname)
 
     def encodeEntities(self, *points):
@@ -359,29 +380,38 @@ class TurtleEncoder:
         if not entity:
             return result
 
-        if entity in self.pointValues:
-            result = "p" + str(self.pointValues.index(entity))
-        elif entity in self.curveValues:
-            result = "c" + str(self.curveValues.index(entity))
+        # resolve through the token maps built in parseSketchData, list scans are O(n) per reference
+        token = self.entityTokenOrNone(entity)
+        if token in self.pointIndexes:
+            result = "p" + str(self.pointIndexes[token])
+        elif token in self.curveIndexes:
+            result = "c" + str(self.curveIndexes[token])
         elif type(entity) == f.SketchPointList: # splines
             result = "s"
             sep = ""
             for c in entity:
-                result += sep + str(self.pointValues.index(c))
+                result += sep + str(self.pointIndexes[c.entityToken])
                 sep = "|"
         elif isinstance(entity, Iterable): # curves
             result = "a"
             sep = ""
             for c in entity:
-                result += sep + str(self.curveValues.index(c))
+                result += sep + str(self.curveIndexes[c.entityToken])
                 sep = "|"
         elif type(entity) == f.OffsetConstraint:
-            result = "o" + str(list(self.constraints).index(entity.entityToken))
+            result = "o" + str(self.constraintIndexes[token])
         else:
             result = self.encodeExpression(entity)
 
         return result
 
+    def entityTokenOrNone(self, entity):
+        # values, vectors and points have no token
+        try:
+            return entity.entityToken
+        except:
+            return None
+
     def encodeEnum(self, enumVal):
         return "e" + str(int(enumVal))
 
@@ -406,10 +436,7 @@ class TurtleEncoder:
         elif tp is f.ModelParameter:
             p = str(expr.expression)
             result += p
-            for pname in self.params:
-                match = re.search("(?<![a-zA-Z0-9_])" + pname + "(?![a-zA-Z0-9_])", p)
-                if match and (not pname in self.usedParams):
-                    self.usedParams.append(pname)
+            self.checkExpressionForUserParam(p)
         else:
             result += self.encodePoint(expr)
         return result
@@ -427,21 +454,21 @@ class TurtleEncoder:
         return result
 
     def encodePoints(self, *points, lineStep = 5):
-        result = ""
         if not points:
-            return result
+            return ""
+        result = []
         comma = ""
         idx = 0
         for pt in points:
             if type(pt) is f.SketchLine:
-                result += comma + self.encodePoint(pt.startSketchPoint) + "," + self.encodePoint(pt.endSketchPoint) 
+                result.append(comma + self.encodePoint(pt.startSketchPoint) + "," + self.encodePoint(pt.endSketchPoint))
             else:
-                result += comma + self.encodePoint(pt)
+                result.append(comma + self.encodePoint(pt))
             comma=",\t"
             idx += 1
             if lineStep > 0 and idx % lineStep == 0:
                 comma = ", # " + str(idx - lineStep) + " - " + str(idx - 1) + "\n"
-        return result
+        return "".join(result)
 
     def encodePoint(self, pt:f.SketchPoint):  
         result = ""
@@ -467,37 +494,28 @@ class TurtleEncoder:
         return result
         
     def encodeChains(self, chains):
-        result = []
         if not chains:
-            return result
+            return ""
 
+        result = []
         index = 0
         for chain in chains:
             startIndex = index
-            s = "\'"
-            comma = ""
+            curves = []
             for curveIndex in chain:
                 curve:f.SketchCurve = self.curveValues[curveIndex]
-                s += comma + self.encodeCurve(curve)
-                comma = " "
+                curves.append(self.encodeCurve(curve))
                 index += 1
             rng = str(startIndex) + "-" + str(index - 1) if index - 1 > startIndex else str(startIndex)
-            s += "\', # " + rng
-            result.append(s)
+            result.append("\'" + " ".join(curves) + "\', # " + rng)
         return "\n".join(result)
         
     def encodeNamedProfiles(self):
         # This encodes by index, which 'usually' works, but need a more robust system.
         # todo: try adding centroid information to the profile - that should be valid until adding dimensions.
-        result = ""
-        comma = ""
+        result = []
         for p in self.namedProfiles:
-            result += comma + "    '" + p + "'" + ":["
-            comma2 = ""
-            for index in self.namedProfiles[p]:
-                result += comma2 + str(index)
-                comma2 = ", "
-            result += "]"
-            comma = ",\n"
+            indexes = ", ".join(str(index) for index in self.namedProfiles[p])
+            result.append("    '" + p + "'" + ":[" + indexes + "]")
 
-        return result
+        return ",\n".join(result)
@@ -0,0 +1,47 @@
+import re
+
+class TurtleExpressionScanner:
+    # Any run of identifier characters. Matching whole runs gives the same word boundaries
+    # as the old per-name "(?<![a-zA-Z0-9_])name(?![a-zA-Z0-9_])" searches, in a single pass.
+    tokenPattern = re.compile(r"[a-zA-Z0-9_]+")
+
+    def __init__(self, renames:dict[str,str] = None, watched:dict = None):
+        self.renames:dict[str,str] = renames if renames is not None else {}  # token -> replacement text
+        self.watched:dict = watched if watched is not None else {}           # token -> key reported when found
+
+    @classmethod
+    def createForDimensionNames(cls, dimensionNames:list[str], paramNames):
+        # encoding: sketch dimension names become __index, user params are reported when used
+        renames = {name:"__" + str(idx) for idx, name in enumerate(dimensionNames)}
+        watched = {name:name for name in paramNames}
+        return cls(renames, watched)
+
+    @classmethod
+    def createForDimensionIndexes(cls, dimensionCount:int):
+        # decoding: __index tokens are reported as forward refs until addRename maps them to a real dimension
+        watched = {"__" + str(idx):idx for idx in range(dimensionCount)}
+        return cls({}, watched)
+
+    def addRename(self, token:str, replacement:str):
+        self.renames[token] = replacement
+
+    def scan(self, expr:str, found:set = None) -> str:
+        # Returns expr with renamed tokens replaced. Watched tokens that were not renamed are added to found.
+        renames = self.renames
+        watched = self.watched
+        def onToken(match):
+            token = match.group(0)
+            if token in renames:
+                return renames[token]
+            if found is not None and token in watched:
+                found.add(watched[token])
+            return token
+        return self.tokenPattern.sub(onToken, expr)
+
+    def findWatched(self, expr:str) -> set:
+        found = set()
+        watched = self.watched
+        for token in self.tokenPattern.findall(expr):
+            if token in watched:
+                found.add(watched[token])
+        return found
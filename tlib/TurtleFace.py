@@ -15,6 +15,12 @@ class TurtleFace:
         self.body = face.body
         self.component = face.body.parentComponent
         self._surfaceKind = SurfaceKind.none
+        # measurements are read from the API once, faces don't change while wrapped
+        self._area:float = None
+        self._boundingBox:core.BoundingBox3D = None
+        self._normal:core.Vector3D = None
+        self._evaluatedNormal:core.Vector3D = None
+        self._centroid:core.Point3D = None
 
     @classmethod
     def createWithFace(cls, face:f.BRepFace):
@@ -22,27 +28,43 @@ class TurtleFace:
         
     @property
     def area(self)->float:
-        return self.face.area
+        if self._area is None:
+            self._area = self.face.area
+        return self._area
         
     @property
     def boundingBox(self)->core.BoundingBox3D:
-        return self.face.boundingBox
+        if self._boundingBox is None:
+            self._boundingBox = self.face.boundingBox
+        return self._boundingBox
     @property
     def xyzLengths(self)->tuple(float,float,float):
         return (self.xLength,self.yLength,self.zLength)
     @property
     def xLength(self)->float:
-        return self.face.boundingBox.maxPoint.x -self.face.boundingBox.minPoint.x
+        return self.boundingBox.maxPoint.x -self.boundingBox.minPoint.x
     @property
     def yLength(self)->float:
-        return self.face.boundingBox.maxPoint.y -self.face.boundingBox.minPoint.y 
+        return self.boundingBox.maxPoint.y -self.boundingBox.minPoint.y 
     @property
     def zLength(self)->float:
-        return self.face.boundingBox.maxPoint.z -self.face.boundingBox.minPoint.z 
+        return self.boundingBox.maxPoint.z -self.boundingBox.minPoint.z 
 
     @property
     def normal(self)->core.Vector3D:
-        return self.face.geometry.normal
+        if self._normal is None:
+            self._normal = self.face.geometry.normal
+        return self._normal
+    @property
+    def evaluatedNormal(self)->core.Vector3D:
+        # normal at a point on the face, accounts for reversed face parameterization unlike the plane normal
+        if self._evaluatedNormal is None:
+            (success, normal) = self.face.evaluator.getNormalAtPoint(self.face.pointOnFace)
+            self._evaluatedNormal = normal if success else False
+        return self._evaluatedNormal if self._evaluatedNormal else None
+    @property
+    def normalKey(self)->tuple[int,int,int]:
+        return self.quantizeVector(self.evaluatedNormal)
     @property
     def isParamReversed(self)->bool:
         return self.face.isParamReversed
@@ -57,7 +79,9 @@ class TurtleFace:
         return next((loop for loop in self.face.loops if loop.isOuter) , None)
     @property
     def centroid(self)->core.Point3D:
-        return self.face.centroid
+        if self._centroid is None:
+            self._centroid = self.face.centroid
+        return self._centroid
     @property
     def vertices(self)->f.BRepVertices:
         return self.face.vertices
@@ -66,11 +90,11 @@ class TurtleFace:
 
     @property
     def minPoint(self)->core.Point3D:
-        minPt = self.face.boundingBox.minPoint
+        minPt = self.boundingBox.minPoint
         return next((vertex.geometry for vertex in self.face.vertices if vertex.geometry.isEqualTo(minPt)) , None)
     @property
     def maxPoint(self)->core.Point3D:
-        maxPt = self.face.boundingBox.maxPoint
+        maxPt = self.boundingBox.maxPoint
         return next((vertex.geometry for vertex in self.face.vertices if vertex.geometry.isEqualTo(maxPt)) , None)
 
     @property
@@ -84,8 +108,8 @@ class TurtleFace:
         return TurtleUtils.reverseVector(self.normal)
 
     def isNormalEqualTo(self, normal:core.Vector3D) -> bool:
-        (success, ownNormal) = self.face.evaluator.getNormalAtPoint(self.face.pointOnFace)
-        return ownNormal.isEqualTo(normal) if success else False
+        ownNormal = self.evaluatedNormal
+        return ownNormal.isEqualTo(normal) if ownNormal else False
 
     def isNormalSame(self, tface:TurtleFace) -> bool:
         return self.isNormalEqualTo(tface.normal)
@@ -93,6 +117,22 @@ class TurtleFace:
     def reverseNormal(self) -> adsk.core.Vector3D:
         return TurtleUtils.reverseVector(self.normal)
 
+    @classmethod
+    def quantizeVector(cls, vector:core.Vector3D, steps:int = 1000) -> tuple[int,int,int]:
+        # hashable direction key, vectors within 1/steps of each other per component share a key
+        if vector is None:
+            return None
+        length = vector.length or 1.0
+        return (round(vector.x / length * steps), round(vector.y / length * steps), round(vector.z / length * steps))
+
+    @classmethod
+    def bucketByNormal(cls, tfaces:list[TurtleFace]) -> dict[tuple[int,int,int], list[TurtleFace]]:
+        # one pass over the faces, grouped by normal direction in their original order
+        result = {}
+        for tface in tfaces:
+            result.setdefault(tface.normalKey, []).append(tface)
+        return result
+
     def minDistanceTo(self, otherFace:f.BRepBody)->float:
         tempBR = f.TemporaryBRepManager.get()
         body1 = tempBR.copy(self.face)
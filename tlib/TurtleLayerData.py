@@ -1,5 +1,6 @@
 
 import adsk.core, adsk.fusion, traceback
+import json
 from .TurtleUtils import TurtleUtils
 
 f:adsk.fusion
@@ -22,7 +23,10 @@ class TurtleLayerData:
     def createWithExisting(cls, extrude:f.ExtrudeFeature):
         #body, layerIndex, bodyIndex, startFaceToken, thickness, isFlipped = cls._getAttributes(body)
         layerIndex, thickness, isFlipped, appearanceIndex = cls._getAttributes(extrude)
-        result = cls(extrude, None, thickness, isFlipped, layerIndex, appearanceIndex)
+        result = cls(None, None, thickness, isFlipped, layerIndex, appearanceIndex)
+        # the attributes are already on the extrude, don't write them back when loading
+        result.extrude = extrude
+        result.profiles = extrude.profile
         return result
 
     @classmethod
@@ -88,21 +92,30 @@ class TurtleLayerData:
     def getExtrudeToken(self):
         return self.extrude.entityToken
 
+    @classmethod
+    def isLayerExtrude(cls, extrude:f.ExtrudeFeature) -> bool:
+        attrs = extrude.attributes
+        return bool(attrs.itemByName("Turtle", "layer") or attrs.itemByName("Turtle", "layerIndex"))
+
     @classmethod
     def _getAttributes(cls, extrude:f.ExtrudeFeature):
         attrs = extrude.attributes
+        attr = attrs.itemByName("Turtle", "layer")
+        if attr:
+            data = json.loads(attr.value)
+            return int(data["layerIndex"]), data["thickness"], bool(data["isFlipped"]), int(data["appearanceIndex"])
+        # layers written before the single attribute
         attr = attrs.itemByName("Turtle", "layerIndex")
         layerIndex = int(attr.value) if attr else -1
         attr = attrs.itemByName("Turtle", "thickness")
         thickness = attr.value if attr else "0"
         attr = attrs.itemByName("Turtle", "isFlipped")
-        isFlipped = bool(attr.value) if attr else False
+        isFlipped = attr.value == "True" if attr else False # written with str(bool), bool("False") is True
         attr = attrs.itemByName("Turtle", "appearanceIndex")
-        appearanceIndex = bool(attr.value) if attr else -1
+        appearanceIndex = int(attr.value) if attr else -1
         return layerIndex, thickness, isFlipped, appearanceIndex
 
-    def _applyAttributesToExtrude(self, body:f.BRepBody):
-        body.attributes.add("Turtle", "layerIndex", str(self.layerIndex))
-        body.attributes.add("Turtle", "thickness", str(self.thickness))
-        body.attributes.add("Turtle", "isFlipped", str(self.isFlipped))
-        body.attributes.add("Turtle", "appearanceIndex", str(self.appearanceIndex))
+    def _applyAttributesToExtrude(self, extrude:f.ExtrudeFeature):
+        # one serialized attribute, each attribute write is a separate API call
+        data = {"layerIndex":self.layerIndex, "thickness":str(self.thickness), "isFlipped":bool(self.isFlipped), "appearanceIndex":self.appearanceIndex}
+        extrude.attributes.add("Turtle", "layer", json.dumps(data))
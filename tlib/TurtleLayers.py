@@ -1,5 +1,6 @@
 import adsk.core, adsk.fusion, traceback
 import os, math, re, sys
+import json
 from .TurtleUtils import TurtleUtils
 from .TurtleParams import TurtleParams
 from .TurtleComponent import TurtleComponent
@@ -23,38 +24,77 @@ class TurtleLayers:
         result = cls(tcomponent)
         attrCount = tcomponent.component.attributes.itemByName("Turtle", "layerCount")
         if attrCount:
-            for feature in tcomponent.component.features.extrudeFeatures:
-                if feature.attributes.itemByName("Turtle", "layerIndex"):
-                    layerData = TurtleLayerData.createWithExisting(feature)
-                    result.layers.append(layerData)
+            features = result._findIndexedExtrudes()
+            if features is None:
+                # no index or a stale one, scan the component's extrudes and rewrite the index
+                features = [feature for feature in tcomponent.component.features.extrudeFeatures if TurtleLayerData.isLayerExtrude(feature)]
+                result._writeLayerIndex([feature.entityToken for feature in features])
+            for feature in features:
+                layerData = TurtleLayerData.createWithExisting(feature)
+                result.layers.append(layerData)
         else:
             print("Mapped layers with non TurtleLayer component (layers will be empty).")
         return result
 
+    def _findIndexedExtrudes(self) -> list[f.ExtrudeFeature]:
+        # layer extrudes from the component's token index in layer order, None if any can't be found
+        attr = self.component.attributes.itemByName("Turtle", "layerTokens")
+        if not attr:
+            return None
+        result = []
+        design = TurtleUtils.activeDesign()
+        for token in json.loads(attr.value):
+            found = design.findEntityByToken(token)
+            feature = f.ExtrudeFeature.cast(found[0]) if found else None
+            if not feature:
+                return None
+            result.append(feature)
+        return result
+
+    def _writeLayerIndex(self, tokens:list[str]):
+        self.component.attributes.add("Turtle", "layerTokens", json.dumps(tokens))
+
+    def _appendToLayerIndex(self, extrudes:list[f.ExtrudeFeature]):
+        attr = self.component.attributes.itemByName("Turtle", "layerTokens")
+        tokens = json.loads(attr.value) if attr else []
+        self._writeLayerIndex(tokens + [extrude.entityToken for extrude in extrudes])
+
     @classmethod
-    def createWithLayerData(cls, tcomponent:TurtleComponent, layerDataList:list, appearanceList = []):
+    def createWithLayerData(cls, tcomponent:TurtleComponent, layerDataList:list, appearanceList = [], offsetStarts:bool = False):
         result = cls(tcomponent)
         countAttr = result.component.attributes.itemByName("Turtle", "layerCount")
         result.layerCount = int(countAttr.value) if countAttr else 0
 
-        newFeatures = result._extrudeWithLayerData(tcomponent, layerDataList, appearanceList)
+        newFeatures = result._extrudeWithLayerData(tcomponent, layerDataList, appearanceList, offsetStarts)
         
         result.component.attributes.add("Turtle", "layerCount", str(result.layerCount))
+        result._appendToLayerIndex(newFeatures)
         return result, newFeatures
 
-    def _extrudeWithLayerData(self, tcomponent:TurtleComponent,  layerDataList:list, appearanceList = []):
+    def _extrudeWithLayerData(self, tcomponent:TurtleComponent,  layerDataList:list, appearanceList = [], offsetStarts:bool = False):
+        # offsetStarts starts each layer at the summed thickness of the layers before it, measured from the profile plane,
+        # rather than from the previous layer's end face. The extrudes then don't depend on each other.
         newFeatures = []
         startFace = None # zero distance from profile plane is default, startFrom is not set
+        startOffsets = self.stackedStartOffsets([layerData.thickness for layerData in layerDataList],\
+            layerDataList[0].isFlipped if layerDataList else False) if offsetStarts else []
         for i, layerData in enumerate(layerDataList):
-            layerData.extrude = tcomponent.extrude(layerData.getProfileCollection(), startFace, layerData.thickness, layerData.isFlipped)
+            if offsetStarts:
+                extrude = tcomponent.extrude(layerData.getProfileCollection(), None, layerData.thickness, layerData.isFlipped, None, None, startOffsets[i])
+            else:
+                extrude = tcomponent.extrude(layerData.getProfileCollection(), startFace, layerData.thickness, layerData.isFlipped)
             layerData.layerIndex = self.layerCount
+            layerData.setExtrude(extrude)
 
             if len(appearanceList) > i and layerData.appearanceIndex > -1:
                 self.tcomponent.colorExtrudedBodiesByIndex(layerData.extrude, appearanceList[layerData.appearanceIndex])
             else:
                 self.tcomponent.colorExtrudedBodiesByThickness(layerData.extrude, layerData.thickness)
-            layerData.startFace = startFace if startFace else layerData.extrude.startFaces[0]
-            startFace = layerData.extrude.endFaces[0]
+            if offsetStarts:
+                layerData.startFace = layerData.getAStartFace()
+            else:
+                layerData.startFace = startFace if startFace else layerData.extrude.startFaces[0]
+                startFace = layerData.extrude.endFaces[0]
             newFeatures.append(layerData.extrude)
             self.layers.append(layerData) # add to internal layers
             self.layerCount += 1
@@ -62,18 +102,34 @@ class TurtleLayers:
         return newFeatures
 
     @classmethod
-    def createFromProfiles(cls, tcomponent:TurtleComponent, profiles:list, thicknesses:list, isFlipped = False, layerCount:int = -1, appearanceList = []):
+    def createFromProfiles(cls, tcomponent:TurtleComponent, profiles:list, thicknesses:list, isFlipped = False, layerCount:int = -1, appearanceList = [],\
+            offsetStarts:bool = False):
         result = cls(tcomponent)
         layerDataList = TurtleLayerData.createLayerDataList(profiles, thicknesses, isFlipped)
 
-        newFeatures = result._extrudeWithLayerData(tcomponent, layerDataList, appearanceList)
+        newFeatures = result._extrudeWithLayerData(tcomponent, layerDataList, appearanceList, offsetStarts)
 
         countAttr = result.component.attributes.itemByName("Turtle", "layerCount")
         count = int(countAttr.value) if countAttr else 0
         result.component.attributes.add("Turtle", "layerCount", str(result.layerCount))
+        result._appendToLayerIndex(newFeatures)
 
         return result, newFeatures
 
+    @classmethod
+    def stackedStartOffsets(cls, thicknesses:list, isFlipped:bool = False) -> list[str]:
+        # start offset expression of each layer, the sum of the thickness expressions below it
+        result = []
+        below = []
+        for thickness in thicknesses:
+            if below:
+                total = " + ".join("(" + str(expr) + ")" for expr in below)
+                result.append("-(" + total + ")" if isFlipped else total)
+            else:
+                result.append(None) # first layer starts on the profile plane
+            below.append(thickness)
+        return result
+
     @classmethod
     def changeExturdeToPlaneOrigin(cls, extrude:f.ExtrudeFeature, faceOrPlane:f.BRepFace, offsetValue:core.ValueInput):
         extrude.timelineObject.rollTo(True)
@@ -104,7 +160,7 @@ class TurtleLayers:
         result = []
         for index in extrudeIndexes:
             if len(self.layers) > index:
-                result.append(*self.layers[index].getBodyList())
+                result.extend(self.layers[index].getBodyList())
         return result
 
     def startFaceAt(self, extrudeIndex:int) -> f.BRepFace:  
@@ -142,31 +198,48 @@ class TurtleLayers:
         return extrusions
 
     def modifyWithProfiles(self, profiles, operation:f.FeatureOperations):
+        # Cuts and intersects use one extrude for each run of consecutive layers sharing a profile, from the first layer's start
+        # to the last layer's end, with all of their bodies as participants. Joins stay one extrude per body, a join with
+        # several participants would merge the bodies into one.
         extrusions = []
-        profiles = profiles if isinstance(profiles, list) else [profiles] * len(self.layerIndexes)
+        profiles = profiles if isinstance(profiles, list) else [profiles] * len(self.layers)
+        isJoin = operation == f.FeatureOperations.JoinFeatureOperation
+        spans = []
         for i, layer in enumerate(self.layers):
             bodies = self.getBodiesFrom(i)
-            pindex = min(i, len(profiles) - 1)
-            for body in bodies:
-                extrudes = self.component.features.extrudeFeatures
-                dist = self.parameters.createValue(layer.thickness)
-                extrudeInput = extrudes.createInput(profiles[pindex][0], operation) 
-
-                endFace = layer.getAnEndFace()
-                if endFace:
-                    end = f.ToEntityExtentDefinition.create(endFace, False, self.parameters.createValue(0))
-                    extrudeInput.setOneSideExtent(end, f.ExtentDirections.PositiveExtentDirection)
-                else:
-                    extrudeInput.setOneSideExtent(layer.extrude.extentOne, f.ExtentDirections.PositiveExtentDirection)
-
-                start = layer.extrude.startExtent
-                # if layers started based on the original profile, use the first start face (because the new join profile might not be on the same plane)
-                if type(start) == f.ProfilePlaneStartDefinition:
-                    start = f.FromEntityStartDefinition.create(layer.getAStartFace(), self.parameters.createValue(0))
-                extrudeInput.startExtent = start
-                extrudeInput.participantBodies = [body]
-                extruded = extrudes.add(extrudeInput) 
-                extrusions.append(extruded)
+            if not bodies:
+                continue
+            profile = profiles[min(i, len(profiles) - 1)][0]
+            if isJoin:
+                spans += [(profile, [layer], [body]) for body in bodies]
+            elif spans and spans[-1][0] == profile and spans[-1][1][-1] is self.layers[i - 1]:
+                spans[-1][1].append(layer)
+                spans[-1][2].extend(bodies)
+            else:
+                spans.append((profile, [layer], bodies))
+
+        extrudes = self.component.features.extrudeFeatures
+        for profile, layers, bodies in spans:
+            extrudeInput = extrudes.createInput(profile, operation) 
+            endFace = layers[-1].getAnEndFace()
+            if endFace:
+                end = f.ToEntityExtentDefinition.create(endFace, False, self.parameters.createValue(0))
+                extrudeInput.setOneSideExtent(end, f.ExtentDirections.PositiveExtentDirection)
+            elif len(layers) == 1:
+                extrudeInput.setOneSideExtent(layers[0].extrude.extentOne, f.ExtentDirections.PositiveExtentDirection)
+            else:
+                # no end face to extend to, use the summed layer thicknesses rather than searching other layers
+                total = " + ".join("(" + str(layer.thickness) + ")" for layer in layers)
+                extrudeInput.setOneSideExtent(f.DistanceExtentDefinition.create(self.parameters.createValue(total)), f.ExtentDirections.PositiveExtentDirection)
+
+            start = layers[0].extrude.startExtent
+            # if layers started based on the original profile, use the first start face (because the new join profile might not be on the same plane)
+            if type(start) == f.ProfilePlaneStartDefinition or type(start) == f.OffsetStartDefinition:
+                start = f.FromEntityStartDefinition.create(layers[0].getAStartFace(), self.parameters.createValue(0))
+            extrudeInput.startExtent = start
+            extrudeInput.participantBodies = bodies
+            extruded = extrudes.add(extrudeInput) 
+            extrusions.append(extruded)
         return extrusions
 
     def mirrorLayers(self, plane:f.ConstructionPlane, isJoined:bool = False):
@@ -7,13 +7,22 @@ f:adsk.fusion
 core:adsk.core
 f,core,app,ui = TurtleUtils.initGlobals()
 
+_handlers = []
+
 class TurtleParams:
+    # User parameters are looked up by name once per design and cached. The cache is dropped when the active design
+    # changes, when a document is activated and when any command terminates (eg. Change Parameters or undo),
+    # see start(). Cached parameters that are no longer valid (eg. created in a rolled back preview) are looked up again.
+    # Expressions are always read from the parameter, previews roll them back without any event.
 
     __useInstance = 'Use Instance'
     _turtleParamsInstance = None
 
     def __init__(self, useInstance, units:str="mm"):
         self.curUnits = units
+        self._design:f.Design = None
+        self._params:dict[str, f.UserParameter] = {} # None for names known to be missing
+        self._hasAllParams = False
 
     @classmethod
     def instance(cls, units:str="mm"):
@@ -21,42 +30,93 @@ class TurtleParams:
             cls._turtleParamsInstance = TurtleParams(cls.__useInstance, units)
         return cls._turtleParamsInstance
 
+    @classmethod
+    def start(cls):
+        # called from the add-in's run(), invalidates the cache on document switches and after commands
+        cls.stop()
+        documentHandler = _InvalidateParamsDocumentHandler()
+        app.documentActivated.add(documentHandler)
+        commandHandler = _InvalidateParamsCommandHandler()
+        ui.commandTerminated.add(commandHandler)
+        _handlers.extend([documentHandler, commandHandler])
+
+    @classmethod
+    def stop(cls):
+        if _handlers:
+            app.documentActivated.remove(_handlers[0])
+            ui.commandTerminated.remove(_handlers[1])
+            _handlers.clear()
+        if cls._turtleParamsInstance:
+            cls._turtleParamsInstance.invalidate()
+
+    def invalidate(self):
+        self._design = None
+        self._params.clear()
+        self._hasAllParams = False
+
     @property
     def currentParams(self):
         return TurtleUtils.activeDesign().userParameters
 
+    def getParam(self, name:str) -> f.UserParameter:
+        self._checkDesign()
+        if name in self._params:
+            result = self._params[name]
+            if result is None or result.isValid:
+                return result
+            self._hasAllParams = False
+        result = self.currentParams.itemByName(name)
+        self._params[name] = result
+        return result
+
+    def _checkDesign(self):
+        design = TurtleUtils.activeDesign()
+        if self._design is None or not self._design.isValid or self._design != design:
+            self.invalidate()
+            self._design = design
+
     def addParams(self, *nameValArray):
         result = []
         for i in range(0, len(nameValArray), 2):
             result.append(self.addOrGetParam(nameValArray[i], nameValArray[i+1]))
         return result
 
+    # Create any parameters that don't already exist, existing ones are left alone
+    def ensureParams(self, nameValues:dict, unitKind="") -> dict[str, f.UserParameter]:
+        return {name:self.addOrGetParam(name, val, unitKind) for name, val in nameValues.items()}
+
+    # Create or change parameters, only expressions that differ are written
+    def setParams(self, nameValues:dict[str, str], unitKind="") -> dict[str, f.UserParameter]:
+        return {name:self.setOrCreateParam(name, val, unitKind) for name, val in nameValues.items()}
+
     # Create parameter if it doesn't already exist
     def addOrGetParam(self, name:str, val, unitKind="", msg=""):
         # todo: need to parse params for expressions and make sure there are no forward refs. Maybe just catch and retry exceptions for now.
         units = self.curUnits if unitKind=="" else unitKind
-        result = TurtleUtils.activeDesign().userParameters.itemByName(name)
+        result = self.getParam(name)
         if result is None:
             fval = self.createValue(val, units)
-            result = TurtleUtils.activeDesign().userParameters.add(name, fval, units, msg)
+            result = self.currentParams.add(name, fval, units, msg)
+            self._params[name] = result
+            self._hasAllParams = False # may be rolled back with a preview, list them again next time
         return result
 
 
     def hasParam(self, name:str):
-        return TurtleUtils.activeDesign().userParameters.itemByName(name) != None
+        return self.getParam(name) != None
 
     def getParamExprOrDefault(self, name:str, defaultValue = ""):
-        param = TurtleUtils.activeDesign().userParameters.itemByName(name)
+        param = self.getParam(name)
         return defaultValue if param is None else param.expression
 
     def getParamValueOrDefault(self, name:str, defaultValue = 0):
-        param = TurtleUtils.activeDesign().userParameters.itemByName(name)
+        param = self.getParam(name)
         return defaultValue if param is None else param.value
 
     # Create or change value of parameter
     def setOrCreateParam(self, name:str, val, unitKind="", msg=""):
         units = self.curUnits if unitKind=="" else unitKind
-        result = TurtleUtils.activeDesign().userParameters.itemByName(name)
+        result = self.getParam(name)
         if not result:
             result = self.addOrGetParam(name, val, units, msg)
         elif result.expression != val:
@@ -75,16 +135,28 @@ class TurtleParams:
             return core.ValueInput.createByObject(val)
 
     def getUserParams(self):
-        result = {}
-        ap = TurtleUtils.activeDesign().userParameters
-        for param in ap:
-            if isinstance(param, f.UserParameter): 
-                result[param.name] = param.expression
-        return result
+        self._checkDesign()
+        if not self._hasAllParams:
+            params = {} # rebuilt so the result keeps the design's parameter order
+            for param in self.currentParams:
+                if isinstance(param, f.UserParameter): 
+                    params[param.name] = param
+            self._params = params
+            self._hasAllParams = True
+        return {name:param.expression for name, param in self._params.items() if param is not None}
 
     def printAllParams(self):
         for param in TurtleUtils.activeDesign().userParameters:
             print(param.name + ": " + param.expression)
 
-    
-
+class _InvalidateParamsDocumentHandler(core.DocumentEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, eventArgs):
+        TurtleParams.instance().invalidate()
+
+class _InvalidateParamsCommandHandler(core.ApplicationCommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, eventArgs):
+        TurtleParams.instance().invalidate()
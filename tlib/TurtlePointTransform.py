@@ -0,0 +1,54 @@
+try:
+    import numpy as np # optional, falls back to plain python when not installed
+except ImportError:
+    np = None
+
+from .data.SketchDataBinary import PackedPoints
+
+class TurtlePointTransform:
+    # Transforms a whole block of 2D sketch data points with a Matrix3D.asArray() matrix (row major 4x4)
+    # in one step, rather than creating and transforming a core.Point3D per point.
+
+    @classmethod
+    def hasNumpy(cls) -> bool:
+        return np is not None
+
+    @classmethod
+    def coordsOf(cls, points) -> list[float]:
+        # flat x,y sequence, packed binary points are used in place
+        if isinstance(points, PackedPoints):
+            return points.coords
+        result = []
+        for pt in points:
+            result.append(pt[0])
+            result.append(pt[1])
+        return result
+
+    @classmethod
+    def transformPoints(cls, matrix:list[float], points) -> list[list[float]]:
+        return cls.transformCoords(matrix, cls.coordsOf(points))
+
+    @classmethod
+    def transformCoords(cls, matrix:list[float], coords) -> list[list[float]]:
+        # returns [x, y, z] per point, z of the source points is 0
+        if len(coords) == 0:
+            return []
+        if np is not None:
+            return cls._transformNumpy(matrix, coords)
+        return cls._transformPython(matrix, coords)
+
+    @classmethod
+    def _transformNumpy(cls, matrix, coords):
+        xy = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        homogeneous = np.empty((len(xy), 4))
+        homogeneous[:, 0:2] = xy
+        homogeneous[:, 2] = 0.0
+        homogeneous[:, 3] = 1.0
+        transformed = homogeneous @ np.asarray(matrix, dtype=np.float64).reshape(4, 4).T
+        return transformed[:, 0:3].tolist()
+
+    @classmethod
+    def _transformPython(cls, matrix, coords):
+        m0, m1, _, m3, m4, m5, _, m7, m8, m9, _, m11 = matrix[:12]
+        return [[m0 * x + m1 * y + m3, m4 * x + m5 * y + m7, m8 * x + m9 * y + m11]\
+            for x, y in zip(coords[0::2], coords[1::2])]
@@ -6,6 +6,8 @@ from functools import cmp_to_key
 from .TurtleUtils import TurtleUtils
 from .TurtlePath import TurtlePath
 from .TurtleParams import TurtleParams
+from .TurtleSpatialIndex import TurtleSpatialIndex
+from .MoldLayout import MoldLayout
 
 f:adsk.fusion
 core:adsk.core
@@ -273,6 +275,7 @@ class TurtleSketch:
         return result
 
     def findPointAt(self, target:core.Point3D):
+        # called once per stamp, a scan that stops at the first match is cheaper than indexing every point
         result = None
         for i in range(self.sketchPoints.count):
             pt:f.SketchPoint = self.sketchPoints.item(i)
@@ -302,10 +305,13 @@ class TurtleSketch:
 
             lines.append(line)
 
+        touchedIndex = TurtleSpatialIndex.createWithPoints(touched,\
+            lambda t: (t.geometry.startPoint.x, t.geometry.startPoint.y), tolerance=TurtlePath.tolerance)
         result = []
         for line in lines:
             isTouched = False
-            for t in touched:
+            start = line.geometry.startPoint
+            for t in touchedIndex.query(start.x, start.y):
                 if TurtlePath.isEquivalentCurve(t, line):
                     isTouched = True
                     break
@@ -598,18 +604,11 @@ class TurtleSketch:
 
     @classmethod
     def createCenteredTabs(cls, startPoint:core.Point3D, endPoint:core.Point3D, tabWidth:float, tabSpacing:float, count:int = -1):
-        lineLen = startPoint.distanceTo(endPoint)
-        tabTotalLen = tabSpacing + tabWidth
-        lineWorking = (lineLen - tabSpacing)
-        slotCount = math.floor(lineWorking / tabTotalLen) if count < 0 else count
-        offset = (lineLen - (slotCount * tabTotalLen + tabSpacing)) / 2.0
+        # same offsets as MoldLayout, so built slots land where the layout and preview put them
         result = []
-        curLen = offset + tabSpacing
-        for i in range(slotCount): # each side of center, plus center
-            pt0 = cls.pointAlongLine(startPoint, endPoint, curLen)
-            curLen += tabWidth
-            pt1 = cls.pointAlongLine(startPoint, endPoint, curLen)
-            curLen += tabSpacing
+        for start in MoldLayout.centeredSlotOffsets(startPoint.distanceTo(endPoint), tabWidth, tabSpacing, count):
+            pt0 = cls.pointAlongLine(startPoint, endPoint, start)
+            pt1 = cls.pointAlongLine(startPoint, endPoint, start + tabWidth)
             result.append((pt0, pt1))
         return result
     
@@ -617,15 +616,9 @@ class TurtleSketch:
     def createFirstTabPoints(cls, startPoint:core.Point3D, endPoint:core.Point3D, tabWidth:float, tabSpacing:float, count:int = -1):
         startPoint = startPoint if isinstance(startPoint, core.Point3D) else startPoint.geometry
         endPoint = endPoint if isinstance(endPoint, core.Point3D) else endPoint.geometry
-        lineLen = startPoint.distanceTo(endPoint)
-        tabTotalLen = tabSpacing + tabWidth
-        lineWorking = (lineLen - tabSpacing)
-        slotCount = math.floor(lineWorking / tabTotalLen) if count == -1 else count
-        offset = (lineLen - (slotCount * tabTotalLen + tabSpacing)) / 2.0
-        start = offset + tabSpacing
-        end = start + tabWidth
+        start = MoldLayout.firstSlotOffset(startPoint.distanceTo(endPoint), tabWidth, tabSpacing, count)
         pt0 = cls.pointAlongLine(startPoint, endPoint, start)
-        pt1 = cls.pointAlongLine(startPoint, endPoint, end)
+        pt1 = cls.pointAlongLine(startPoint, endPoint, start + tabWidth)
         return (pt0, pt1)
     
     # @classmethod
@@ -0,0 +1,59 @@
+import math
+
+class TurtleSpatialIndex:
+    # Uniform grid hash over sketch x,y coordinates. Lookups only visit the cells around the query,
+    # so finding coincident points or matching lines doesn't scan every entity.
+    # Results come back in insertion order, so 'first match' behaves the same as a linear scan.
+    tolerance = 0.00001
+
+    def __init__(self, cellSize:float = 0.1, tolerance:float = None):
+        self.cellSize = cellSize
+        self.tolerance = TurtleSpatialIndex.tolerance if tolerance is None else tolerance
+        self.cells:dict[tuple[int,int], list] = {} # cell -> [(seq, x, y, item)]
+        self.count = 0
+        self._seq = 0
+
+    @classmethod
+    def createWithPoints(cls, items, getXY, cellSize:float = 0.1, tolerance:float = None):
+        # getXY(item) returns the x,y to index the item by
+        result = cls(cellSize, tolerance)
+        for item in items:
+            x, y = getXY(item)
+            result.insert(x, y, item)
+        return result
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, x:float, y:float, item):
+        key = self._cell(x, y)
+        self.cells.setdefault(key, []).append((self._seq, x, y, item))
+        self._seq += 1
+        self.count += 1
+
+    def remove(self, x:float, y:float, item) -> bool:
+        entries = self.cells.get(self._cell(x, y))
+        if entries:
+            for i, entry in enumerate(entries):
+                if entry[3] == item:
+                    del entries[i]
+                    self.count -= 1
+                    return True
+        return False
+
+    def query(self, x:float, y:float, tolerance:float = None) -> list:
+        # items within tolerance on both axes, in insertion order
+        tol = self.tolerance if tolerance is None else tolerance
+        (x0, y0) = self._cell(x - tol, y - tol)
+        (x1, y1) = self._cell(x + tol, y + tol)
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for entry in self.cells.get((cx, cy), ()):
+                    if abs(entry[1] - x) <= tol and abs(entry[2] - y) <= tol:
+                        found.append(entry)
+        found.sort(key=lambda entry: entry[0])
+        return [entry[3] for entry in found]
+
+    def _cell(self, x:float, y:float) -> tuple[int,int]:
+        return (math.floor(x / self.cellSize), math.floor(y / self.cellSize))
@@ -1,6 +1,6 @@
 from modulefinder import Module
 import adsk.core, adsk.fusion, adsk.cam, traceback, os
-import tkinter as tk
+from .TurtleClipboard import TurtleClipboard
 from enum import Enum
 
 __decimalPlaces__ = 6
@@ -78,45 +78,15 @@ class TurtleUtils:
 
     @classmethod
     def getClipboardText(cls):
-        result = ""
-        # f = open("sketchData.txt", "w")
-        # f.write(result)
-        # f.close()
-        # command = 'type sketchData.txt | clip'
-        # os.system(command)
-        root = TurtleUtils.activeRoot()
-        root = tk.Tk()
-        root.withdraw()
-        try:
-            #result = root.selection_get(selection = "CLIPBOARD") 
-            result = root.clipboard_get()
-            root.update()
-            # this clipboard is quite flakey, without this text can be on the clipboard but not detected
-            # cls.clearClipboardText()
-            #cls.setClipboardText(result) 
-        except tk.TclError:
-            #pass
-            print(traceback.format_exc())
-        return result
+        return TurtleClipboard.instance().getText()
 
     @classmethod
     def setClipboardText(cls, data):
-        root = TurtleUtils.activeRoot()
-        root = tk.Tk()
-        root.withdraw()
-        root.clipboard_clear()
-        root.clipboard_append(data)
-        root.update() # now it stays on the clipboard after the window is closed
-        root.destroy()
+        TurtleClipboard.instance().setText(data)
 
     @classmethod
     def clearClipboardText(cls):
-        root = TurtleUtils.activeRoot()
-        root = tk.Tk()
-        root.withdraw()
-        root.clipboard_clear()
-        root.update()
-        root.destroy()
+        TurtleClipboard.instance().clear()
         
     @classmethod
     def ensureObjectCollection(cls, itemList):
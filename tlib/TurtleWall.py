@@ -57,7 +57,7 @@ class TurtleWall:
 
     @classmethod
     def create(cls, face:f.BRepFace, wallKind:WallKind, crossData:WallData, outwardData:WallData, useOuterLoop:bool = True):
-        result = cls(face, wallKind, crossData, outwardData, useOuterLoop) 
+        result = cls(face, wallKind, crossData, outwardData, useOuterLoop)
         result.run()
         return result
 
@@ -137,11 +137,11 @@ class TurtleWall:
         negStr = "-" if flipDirection else ""
         self.tSketch.offset(boundryLines, self.face.centroid, negStr + "lipWidth", False)
         if self.useOuterLoop:
-            lipFeature = self.tComponent.extrudeOuterProfile(self.tSketch, self.wallThicknessExpr, self.colorIndex)
-            TurtleLayers.changeExtrudeOperation(lipFeature, self.baseFeature.bodies, f.FeatureOperations.JoinFeatureOperation)
+            lipFeature = self.tComponent.extrudeOuterProfile(self.tSketch, self.wallThicknessExpr, self.colorIndex,\
+                f.FeatureOperations.JoinFeatureOperation, self.baseFeature.bodies)
         else: # hole
-            lipFeature = self.tComponent.extrudeAllButOuterProfile(self.tSketch, self.wallThicknessExpr, self.colorIndex)
-            TurtleLayers.changeExtrudeOperation(lipFeature, self.baseFeature.bodies, f.FeatureOperations.CutFeatureOperation)
+            lipFeature = self.tComponent.extrudeAllButOuterProfile(self.tSketch, self.wallThicknessExpr, self.colorIndex,\
+                f.FeatureOperations.CutFeatureOperation, self.baseFeature.bodies)
         return lipFeature
 
     def makeOffsetBoundry(self, edgeIndexes:list[int], expression:str):
@@ -185,15 +185,11 @@ class TurtleWall:
             drawData = SketchData.createFromBuiltIn(slotKind)
             mirror = not wallData.isMirror if wallData.mirrorInvert else wallData.isMirror
             decoder = TurtleDecoder.createWithPoints(drawData, wallData.tSketch, tabPts, False, mirror)
-            slotFeature = self.tComponent.extrudeOuterProfile(wallData.tSketch, self.wallThicknessExpr, 1)
-
-            if self.baseFeature:
-                if op == f.FeatureOperations.CutFeatureOperation:
-                    TurtleLayers.changeExtrudeOperation(slotFeature, self.baseFeature.bodies, op)
-                elif op == f.FeatureOperations.JoinFeatureOperation:
-                    TurtleLayers.changeExtrudeOperation(slotFeature, self.baseFeature.bodies, op)
-                elif op == f.FeatureOperations.IntersectFeatureOperation:
-                    TurtleLayers.changeExtrudeOperation(slotFeature, self.baseFeature.bodies, op)
+            if self.baseFeature and op in (f.FeatureOperations.CutFeatureOperation, f.FeatureOperations.JoinFeatureOperation,\
+                    f.FeatureOperations.IntersectFeatureOperation):
+                slotFeature = self.tComponent.extrudeOuterProfile(wallData.tSketch, self.wallThicknessExpr, 1, op, self.baseFeature.bodies)
+            else:
+                slotFeature = self.tComponent.extrudeOuterProfile(wallData.tSketch, self.wallThicknessExpr, 1)
             rectangularFeature = None
             if wallData.slotCount > 1:
                 rectangularPatterns = self.component.features.rectangularPatternFeatures
@@ -5,6 +5,7 @@ from enum import Enum
 from .TurtleSketch import TurtleSketch
 from .TurtleUtils import TurtleUtils
 from .data.SketchData import Sketches
+from .MoldLayout import MoldLayout
 
 f:adsk.fusion
 core:adsk.core
@@ -100,21 +101,7 @@ class WallKind(Enum):
         return int(wallKind.value) % 10 == 2
     @classmethod
     def edgesToOffsetForKind(cls, wallKind)->tuple[list[int], bool]: # cw from bottom left
-        result = []
-        isNeg = False
-        if cls.isTopBottom(wallKind):
-            isNeg = False
-            result = [] if cls.isInner(wallKind) else [0,1,2,3] # expand all lid, none for floor
-        elif cls.isLeftRight(wallKind):
-            isNeg = True
-            result = [0,2,3] if cls.isInner(wallKind) else [] # contract sides, and floor line if inner
-        elif cls.isFrontBack(wallKind):
-            isNeg = True
-            result = [3] if cls.isInner(wallKind) else [0,2] # contract floor line if inner
-        elif cls.isHole(wallKind):
-            isNeg = True
-            result = [0,1,2,3] # expand all the top hole edges inward to make room for slot holes on wall line
-        return (result, isNeg)
+        return MoldLayout.edgesToOffset(int(wallKind.value))
     @classmethod
     def getSlotKinds(cls, wallKind)->list[int]:
         result = []
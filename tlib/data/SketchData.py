@@ -2,6 +2,12 @@ import os, math, re, ast, traceback
 from enum import Enum
 import adsk.core, adsk.fusion, adsk.cam
 from ..TurtleUtils import TurtleUtils
+from ..TurtleClipboard import TurtleClipboard
+from .SketchDataLoader import SketchDataLoader, SketchDataError
+from .SketchDataBinary import SketchDataBinary
+from .SketchDataBundle import SketchDataBundle
+from .SketchDataCache import SketchDataCache
+from .SketchDataCompiler import SketchDataCompiler, CompiledCurve, CompiledRecord
 
 f:adsk.fusion
 core:adsk.core
@@ -73,26 +79,60 @@ class SketchData:
         self.encStartGuidePoint:core.Point3D = None
         self.encEndGuidePoint:core.Point3D = None
 
+        # compiled forms of the encoded strings, built on first use
+        self._compiledChains:list[list[CompiledCurve]] = None
+        self._compiledConstraints:list[CompiledRecord] = None
+        self._compiledDimensions:list[CompiledRecord] = None
+        self._compiledParams:dict[str,str] = None
+
         self.decodeSketchData(data)
 
     @classmethod
     def createFromFile(cls, filename:str):
+        # cached by path and modification time, an edited file is loaded again
+        return SketchDataCache.get(SketchDataCache.fileKey(filename), lambda: cls._loadFile(filename))
+
+    @classmethod
+    def _loadFile(cls, filename:str):
+        if SketchDataBinary.isBinaryFile(filename):
+            return cls.createFromBinaryFile(filename)
+        if SketchDataBundle.isBundleFile(filename):
+            return cls._loadFromBundle(filename, 0) # the first sketch, use createFromBundle to choose another
         file = open(filename, "r")
         sData = file.read()
         file.close()
-        if sData is None or not sData.startswith("{#Turtle Generated Data"):
+        if not SketchDataLoader.isTurtleData(sData):
             data = SketchData.getDefaultRawData()
         else:
-            data = eval(sData)
+            data = SketchDataLoader.loadSketchData(sData) # raises SketchDataError with line and column if malformed
         return cls(data)
 
+    @classmethod
+    def createFromBinaryFile(cls, filename:str):
+        # points are read from the file's bytes on access, not copied into lists
+        return cls(SketchDataBinary.loadFile(filename))
+
+    @classmethod
+    def createFromBundle(cls, filename:str, index:int):
+        # only the chosen sketch is decoded, the rest of the bundle is left alone
+        key = SketchDataCache.fileKey(filename) + (index,)
+        return SketchDataCache.get(key, lambda: cls._loadFromBundle(filename, index))
+
+    @classmethod
+    def _loadFromBundle(cls, filename:str, index:int):
+        return cls(SketchDataBundle.createFromFile(filename).loadData(index))
+
     @classmethod
     def createFromClipboard(cls):
         clip = TurtleUtils.getClipboardText()
-        if clip is None or not clip.startswith("{#Turtle Generated Data"):
+        return SketchDataCache.get(SketchDataCache.clipboardKey(TurtleClipboard.contentHash(clip)), lambda: cls._loadText(clip))
+
+    @classmethod
+    def _loadText(cls, text:str):
+        if not SketchDataLoader.isTurtleData(text):
             data = SketchData.getDefaultRawData()
         else:
-            data = eval(clip)
+            data = SketchDataLoader.loadSketchData(text)
         return cls(data)
 
     @classmethod
@@ -106,6 +146,10 @@ class SketchData:
 
     @classmethod
     def createFromBuiltIn(cls, kind:Sketches):
+        return SketchDataCache.get(SketchDataCache.builtInKey(kind.name), lambda: cls._loadBuiltIn(kind))
+
+    @classmethod
+    def _loadBuiltIn(cls, kind:Sketches):
         if kind == Sketches.offsetHole:
             data = cls.offsetHole()
         elif kind == Sketches.edgeHole:
@@ -147,6 +191,39 @@ class SketchData:
         if self.guidepointValues:
             self.hasEncodedGuidepoint = True
 
+    @property
+    def compiledChains(self) -> list[list[CompiledCurve]]:
+        if self._compiledChains is None:
+            self._compiledChains = SketchDataCompiler.compileChains(self.chainValues)
+        return self._compiledChains
+
+    @property
+    def compiledConstraints(self) -> list[CompiledRecord]:
+        # in draw order
+        if self._compiledConstraints is None:
+            self._compiledConstraints = SketchDataCompiler.compileConstraints(self.constraintValues)
+        return self._compiledConstraints
+
+    @property
+    def compiledDimensions(self) -> list[CompiledRecord]:
+        if self._compiledDimensions is None:
+            self._compiledDimensions = SketchDataCompiler.compileDimensions(self.dimensionValues)
+        return self._compiledDimensions
+
+    @property
+    def compiledParams(self) -> dict[str,str]:
+        # param name -> expression with the d[...] stripped
+        if self._compiledParams is None:
+            self._compiledParams = SketchDataCompiler.compileUserParams(self.params)
+        return self._compiledParams
+
+    @property
+    def approximateSize(self) -> int:
+        # rough bytes held once decoded and compiled, for SketchDataCache's limit. Points as python lists
+        # of floats, records by their text with as much again for the compiled forms.
+        records = (self.chainValues, self.constraintValues, self.dimensionValues)
+        textLen = sum(len(record) for values in records for record in values) + sum(len(k) + len(v) for k, v in self.params.items())
+        return 64 * (len(self.pointValues) + len(self.profileCentroids)) + 2 * textLen + 1024
 
     def parseIndexOnly(self, param):
         val = param[1:]
@@ -160,11 +237,6 @@ class SketchData:
         file.close()
         return result
 
-    @classmethod
-    def saveData(cls, filename:str, data:str):
-        file = open(filename, "w")
-        file.write(data)
-        file.close()
 
 
 
@@ -0,0 +1,321 @@
+import re, struct, sys
+from collections.abc import Sequence
+from .SketchDataLoader import SketchDataLoader, SketchDataError
+
+class PackedPoints(Sequence):
+    # Read only view of packed float64 x,y pairs, over the bytes read from the file. Values are materialized as
+    # fresh [x, y] or [x, y, 'f'] lists on access, so no per point lists are built on load and callers can't
+    # mutate the shared data.
+    def __init__(self, coords, flags = None):
+        self.coords = coords # memoryview cast to 'd', or any float sequence
+        self.flags = flags # memoryview of uint8, 1 for fixed points, or None
+
+    def __len__(self):
+        return len(self.coords) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("point index out of range")
+        result = [self.coords[index * 2], self.coords[index * 2 + 1]]
+        if self.flags is not None and self.flags[index]:
+            result.append('f')
+        return result
+
+class SketchDataBinary:
+    # .tskb layout, little endian, every section 8 byte aligned:
+    #   header:    'TSKB', uint32 version, uint32 sectionCount, uint32 reserved
+    #   directory: sectionCount * (4s tag, uint32 pad, uint64 offset, uint64 length)
+    #   sections:  STRS string table, CSYS/BNDS/PNTS/CENT float64 blocks, PFLG point flags,
+    #              PRMS/CHNS/CONS/DIMS/GUID/NPRF int32 tables. Curve, constraint and dimension records
+    #              are (opcode, argument string index) pairs, the opcode is the packed ascii kind prefix.
+    magic = b"TSKB"
+    version = 1
+    _headerFormat = "<4sIII"
+    _entryFormat = "<4sIQQ"
+
+    _chainPrefix = re.compile(r"[xX][fF][A-Z]")
+    _constraintPrefix = re.compile(r"[A-Z]{2}")
+    _dimensionPrefix = re.compile(r"[A-Z]{3}")
+
+    # ---- writing ----
+
+    @classmethod
+    def encode(cls, data:dict) -> bytes:
+        strings = _StringTable()
+        sections = cls.encodeSections(data, strings)
+        sections.insert(0, (b"STRS", strings.pack()))
+        return cls._packSections(sections)
+
+    @classmethod
+    def encodeSections(cls, data:dict, strings) -> list[tuple[bytes, bytes]]:
+        # every section but STRS, string indexes go into the passed table so several sketches can share one
+        sections = []
+
+        if "CoordinateSystem" in data:
+            sections.append((b"CSYS", cls._packFloats(data["CoordinateSystem"])))
+        if "PointBounds" in data:
+            sections.append((b"BNDS", cls._packFloats([v for pt in data["PointBounds"] for v in pt[:2]])))
+
+        points = data.get("Points", [])
+        sections.append((b"PNTS", cls._packFloats([v for pt in points for v in pt[:2]])))
+        sections.append((b"PFLG", bytes(1 if len(pt) > 2 and pt[2] == 'f' else 0 for pt in points)))
+        sections.append((b"CENT", cls._packFloats([v for pt in data.get("ProfileCentroids", []) for v in pt[:2]])))
+
+        params = []
+        for name, expr in data.get("Params", {}).items():
+            params += [strings.add(name), strings.add(expr)]
+        sections.append((b"PRMS", cls._packInts(params)))
+
+        chains = [len(data.get("Chains", []))]
+        for chain in data.get("Chains", []):
+            segs = [seg for seg in chain.split(" ") if seg]
+            chains.append(len(segs))
+            for seg in segs:
+                chains += cls._opRecord(seg, cls._chainPrefix, strings)
+        sections.append((b"CHNS", cls._packInts(chains)))
+
+        constraints = []
+        for con in data.get("Constraints", []):
+            constraints += cls._opRecord(con, cls._constraintPrefix, strings)
+        sections.append((b"CONS", cls._packInts(constraints)))
+
+        dimensions = []
+        for dim in data.get("Dimensions", []):
+            dimensions += cls._opRecord(dim, cls._dimensionPrefix, strings)
+        sections.append((b"DIMS", cls._packInts(dimensions)))
+
+        guide = [0, 0]
+        if data.get("Guidepoint"):
+            guide = [2, len(data["Guidepoint"])] + [strings.add(v) for v in data["Guidepoint"]]
+        elif data.get("Guideline"):
+            guide = [1, len(data["Guideline"])] + [strings.add(v) for v in data["Guideline"]]
+        sections.append((b"GUID", cls._packInts(guide)))
+
+        named = [len(data.get("NamedProfiles", {}))]
+        for name, indexes in data.get("NamedProfiles", {}).items():
+            named += [strings.add(name), len(indexes)] + list(indexes)
+        sections.append((b"NPRF", cls._packInts(named)))
+        return sections
+
+    @classmethod
+    def writeFile(cls, filename:str, data:dict):
+        with open(filename, "wb") as file:
+            file.write(cls.encode(data))
+
+    @classmethod
+    def writeTextAsBinary(cls, text:str, filename:str):
+        cls.writeFile(filename, SketchDataLoader.loadSketchData(text))
+
+    # ---- reading ----
+
+    @classmethod
+    def isBinaryFile(cls, filename:str) -> bool:
+        with open(filename, "rb") as file:
+            return file.read(4) == cls.magic
+
+    @classmethod
+    def loadFile(cls, filename:str) -> dict:
+        # Read into bytes in one call and closed, so the file can be rewritten while the result is cached.
+        # The point blocks in the result are views into those bytes.
+        with open(filename, "rb") as file:
+            return cls.decode(file.read())
+
+    @classmethod
+    def readSections(cls, filename:str, tags:list[bytes]) -> tuple[dict[bytes, bytes], dict[bytes, int]]:
+        # Reads the directory and only the requested sections, for summaries without decoding the whole file.
+        # Returns the requested payloads and the length of every section.
+        headerSize = struct.calcsize(cls._headerFormat)
+        entrySize = struct.calcsize(cls._entryFormat)
+        with open(filename, "rb") as file:
+            header = file.read(headerSize)
+            if len(header) < headerSize:
+                raise SketchDataError("Binary sketch data is truncated", 0, 0)
+            magic, version, sectionCount, _ = struct.unpack(cls._headerFormat, header)
+            if magic != cls.magic:
+                raise SketchDataError("Not a Turtle binary sketch", 0, 0)
+            if version > cls.version:
+                raise SketchDataError("Unsupported Turtle binary sketch version " + str(version), 0, 0)
+            directory = file.read(entrySize * sectionCount)
+            if len(directory) < entrySize * sectionCount:
+                raise SketchDataError("Binary sketch directory is truncated", 0, 0)
+            payloads = {}
+            lengths = {}
+            for i in range(sectionCount):
+                tag, _, offset, length = struct.unpack_from(cls._entryFormat, directory, i * entrySize)
+                lengths[tag] = length
+                if tag in tags:
+                    file.seek(offset)
+                    payloads[tag] = file.read(length)
+                    if len(payloads[tag]) < length:
+                        raise SketchDataError("Binary sketch section " + tag.decode("ascii", "replace") + " is truncated", 0, 0)
+        return (payloads, lengths)
+
+    @classmethod
+    def decode(cls, buffer) -> dict:
+        sections = cls._unpackSections(memoryview(buffer))
+        return cls.decodeSections(sections, _StringTable.unpack(sections[b"STRS"]))
+
+    @classmethod
+    def _unpackSections(cls, view:memoryview) -> dict[bytes, memoryview]:
+        if len(view) < struct.calcsize(cls._headerFormat):
+            raise SketchDataError("Binary sketch data is truncated", 0, 0)
+        magic, version, sectionCount, _ = struct.unpack_from(cls._headerFormat, view, 0)
+        if magic != cls.magic:
+            raise SketchDataError("Not a Turtle binary sketch", 0, 0)
+        if version > cls.version:
+            raise SketchDataError("Unsupported Turtle binary sketch version " + str(version), 0, 0)
+
+        sections = {}
+        pos = struct.calcsize(cls._headerFormat)
+        entrySize = struct.calcsize(cls._entryFormat)
+        for i in range(sectionCount):
+            tag, _, offset, length = struct.unpack_from(cls._entryFormat, view, pos + i * entrySize)
+            if offset + length > len(view):
+                raise SketchDataError("Binary sketch section " + tag.decode("ascii", "replace") + " is truncated", 0, 0)
+            sections[tag] = view[offset:offset + length]
+        return sections
+
+    @classmethod
+    def decodeSections(cls, sections:dict[bytes, memoryview], strings:list[str]) -> dict:
+        result = {}
+        if b"CSYS" in sections:
+            result["CoordinateSystem"] = list(cls._floatView(sections[b"CSYS"]))
+        if b"BNDS" in sections:
+            bounds = cls._floatView(sections[b"BNDS"])
+            result["PointBounds"] = [[bounds[0], bounds[1]], [bounds[2], bounds[3]]]
+
+        params = cls._intView(sections[b"PRMS"])
+        result["Params"] = {strings[params[i]]:strings[params[i + 1]] for i in range(0, len(params), 2)}
+        result["Points"] = PackedPoints(cls._floatView(sections[b"PNTS"]), sections[b"PFLG"])
+
+        ints = cls._intView(sections[b"CHNS"])
+        chains = []
+        pos = 1
+        for _ in range(ints[0]):
+            segCount = ints[pos]
+            pos += 1
+            segs = []
+            for _ in range(segCount):
+                segs.append(cls._opText(ints[pos], strings[ints[pos + 1]]))
+                pos += 2
+            chains.append(" ".join(segs))
+        result["Chains"] = chains
+
+        constraints = cls._opTexts(cls._intView(sections[b"CONS"]), strings)
+        if constraints:
+            result["Constraints"] = constraints
+        dimensions = cls._opTexts(cls._intView(sections[b"DIMS"]), strings)
+        if dimensions:
+            result["Dimensions"] = dimensions
+
+        guide = cls._intView(sections[b"GUID"])
+        guideValues = [strings[guide[2 + i]] for i in range(guide[1])]
+        if guide[0] == 2:
+            result["Guidepoint"] = guideValues
+        else:
+            result["Guideline"] = guideValues
+
+        result["ProfileCentroids"] = PackedPoints(cls._floatView(sections[b"CENT"]))
+
+        ints = cls._intView(sections[b"NPRF"])
+        named = {}
+        pos = 1
+        for _ in range(ints[0]):
+            name = strings[ints[pos]]
+            count = ints[pos + 1]
+            named[name] = list(ints[pos + 2:pos + 2 + count])
+            pos += 2 + count
+        result["NamedProfiles"] = named
+        return result
+
+    # ---- helpers ----
+
+    @classmethod
+    def _opRecord(cls, text:str, prefix:re.Pattern, strings) -> list[int]:
+        match = prefix.match(text)
+        if not match:
+            raise SketchDataError("Unrecognized record '" + text + "'", 0, 0)
+        kind = match.group(0)
+        return [int.from_bytes(kind.encode("ascii").ljust(4, b"\0"), "little"), strings.add(text[len(kind):])]
+
+    @classmethod
+    def _opText(cls, opcode:int, args:str) -> str:
+        return opcode.to_bytes(4, "little").rstrip(b"\0").decode("ascii") + args
+
+    @classmethod
+    def _opTexts(cls, ints, strings) -> list[str]:
+        return [cls._opText(ints[i], strings[ints[i + 1]]) for i in range(0, len(ints), 2)]
+
+    @classmethod
+    def _packFloats(cls, values) -> bytes:
+        return struct.pack("<" + str(len(values)) + "d", *values)
+
+    @classmethod
+    def _packInts(cls, values) -> bytes:
+        return struct.pack("<" + str(len(values)) + "i", *values)
+
+    @classmethod
+    def _floatView(cls, view:memoryview):
+        if sys.byteorder == "little":
+            return view.cast("B").cast("d")
+        return list(struct.unpack("<" + str(len(view) // 8) + "d", view))
+
+    @classmethod
+    def _intView(cls, view:memoryview):
+        if sys.byteorder == "little":
+            return view.cast("B").cast("i")
+        return list(struct.unpack("<" + str(len(view) // 4) + "i", view))
+
+    @classmethod
+    def _packSections(cls, sections:list[tuple[bytes, bytes]]) -> bytes:
+        headerSize = struct.calcsize(cls._headerFormat) + struct.calcsize(cls._entryFormat) * len(sections)
+        offset = cls._align(headerSize)
+        directory = []
+        body = []
+        for tag, payload in sections:
+            directory.append(struct.pack(cls._entryFormat, tag, 0, offset, len(payload)))
+            padded = payload + b"\0" * (cls._align(len(payload)) - len(payload))
+            body.append(padded)
+            offset += len(padded)
+        header = struct.pack(cls._headerFormat, cls.magic, cls.version, len(sections), 0) + b"".join(directory)
+        header += b"\0" * (cls._align(headerSize) - headerSize)
+        return header + b"".join(body)
+
+    @classmethod
+    def _align(cls, size:int) -> int:
+        return (size + 7) & ~7
+
+class _StringTable:
+    def __init__(self):
+        self.strings:list[str] = []
+        self.indexes:dict[str, int] = {}
+
+    def add(self, text:str) -> int:
+        result = self.indexes.get(text)
+        if result is None:
+            result = len(self.strings)
+            self.indexes[text] = result
+            self.strings.append(text)
+        return result
+
+    def pack(self) -> bytes:
+        encoded = [s.encode("utf-8") for s in self.strings]
+        offsets = [0]
+        for e in encoded:
+            offsets.append(offsets[-1] + len(e))
+        return struct.pack("<" + str(len(offsets) + 1) + "I", len(self.strings), *offsets) + b"".join(encoded)
+
+    @classmethod
+    def unpack(cls, view:memoryview) -> list[str]:
+        count = struct.unpack_from("<I", view, 0)[0]
+        offsets = struct.unpack_from("<" + str(count + 1) + "I", view, 4)
+        blobStart = 4 + (count + 1) * 4
+        blob = bytes(view[blobStart:blobStart + offsets[-1]]).decode("utf-8")
+        if blob.isascii():
+            return [blob[offsets[i]:offsets[i + 1]] for i in range(count)]
+        raw = view[blobStart:]
+        return [bytes(raw[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(count)]
@@ -0,0 +1,159 @@
+import os, mmap, struct, hashlib, threading
+from collections import OrderedDict
+from .SketchDataLoader import SketchDataError
+from .SketchDataBinary import SketchDataBinary, _StringTable
+
+class SketchDataBundle(SketchDataBinary):
+    # .tsks, several sketches in one file using the .tskb section layout:
+    #   STRS  string table shared by every sketch
+    #   PRMS  shared Params table, (name, expression) string index pairs, each distinct pair stored once
+    #   NAME  int32 sketch name string indexes
+    #   SKCH  int32 block index per sketch for each of blockTags, -1 if the sketch has no such section
+    #   BDIR  uint64 (offset, length) per block, offsets from the start of BLKS
+    #   BLKS  the blocks, 8 byte aligned. A block is a .tskb section payload, identical payloads are stored once.
+    #         PRMI blocks are int32 indexes into the shared PRMS pairs.
+    # Only the tables are read on open, a sketch's blocks are copied out of the mapping and decoded when it is loaded,
+    # so loaded sketches don't hold the mapping and close() can release the file.
+    magic = b"TSKS"
+    version = 1
+    extension = ".tsks"
+    blockTags = (b"CSYS", b"BNDS", b"PNTS", b"PFLG", b"CENT", b"CHNS", b"CONS", b"DIMS", b"GUID", b"NPRF", b"PRMI")
+
+    maxOpen = 8
+    _open:OrderedDict = OrderedDict() # path -> (mtime, size, bundle), least recently used are closed past maxOpen
+    _lock = threading.Lock()
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        view = memoryview(buffer)
+        sections = self._unpackSections(view)
+        self.strings = _StringTable.unpack(sections[b"STRS"])
+        self.names = [self.strings[i] for i in self._intView(sections[b"NAME"])]
+        self.params = list(self._intView(sections[b"PRMS"]))
+        self.sketchBlocks = list(self._intView(sections[b"SKCH"]))
+        self.blockDirectory = struct.unpack("<" + str(len(sections[b"BDIR"]) // 8) + "Q", sections[b"BDIR"])
+        self.blocks = sections.pop(b"BLKS")
+        # only self.blocks may reference the mapping after this, so close() can release it
+        for section in sections.values():
+            section.release()
+        view.release()
+
+    @classmethod
+    def createFromFile(cls, filename:str):
+        # memory mapped and kept open per file, so loading several sketches reads the tables once
+        stat = os.stat(filename)
+        path = os.path.abspath(filename)
+        with cls._lock:
+            entry = cls._open.get(path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                cls._open.move_to_end(path)
+                return entry[2]
+            if entry:
+                entry[2].close()
+            with open(filename, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            result = cls(mapped)
+            cls._open[path] = (stat.st_mtime_ns, stat.st_size, result)
+            cls._open.move_to_end(path)
+            while len(cls._open) > cls.maxOpen:
+                cls._open.popitem(last = False)[1][2].close()
+        return result
+
+    @classmethod
+    def release(cls, filename:str):
+        # closes the file's mapping, call before rewriting it (Windows won't replace a mapped file)
+        with cls._lock:
+            entry = cls._open.pop(os.path.abspath(filename), None)
+            if entry:
+                entry[2].close()
+
+    def close(self):
+        if self.blocks is not None:
+            self.blocks.release()
+            self.blocks = None
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.buffer = None
+
+    @classmethod
+    def isBundleFile(cls, filename:str) -> bool:
+        with open(filename, "rb") as file:
+            return file.read(4) == cls.magic
+
+    def __len__(self):
+        return len(self.names)
+
+    def indexOf(self, name:str) -> int:
+        return self.names.index(name) if name in self.names else -1
+
+    def loadData(self, index:int) -> dict:
+        # decodes only this sketch's blocks, points are views into the copied blocks
+        if index < 0 or index >= len(self.names):
+            raise SketchDataError("Bundle has no sketch " + str(index), 0, 0)
+        if self.blocks is None:
+            raise SketchDataError("Bundle is closed", 0, 0)
+        sections = {}
+        rowStart = index * len(self.blockTags)
+        for col, tag in enumerate(self.blockTags):
+            block = self.sketchBlocks[rowStart + col]
+            if block >= 0:
+                offset = self.blockDirectory[block * 2]
+                sections[tag] = memoryview(bytes(self.blocks[offset:offset + self.blockDirectory[block * 2 + 1]]))
+        pairIndexes = self._intView(sections.pop(b"PRMI"))
+        sections[b"PRMS"] = memoryview(self._packInts([v for i in pairIndexes for v in self.params[i * 2:i * 2 + 2]]))
+        return self.decodeSections(sections, self.strings)
+
+    # ---- writing ----
+
+    @classmethod
+    def encode(cls, sketches:list[tuple[str, dict]]) -> bytes:
+        # sketches are (name, data) pairs, data as returned by SketchDataLoader.loadSketchData
+        strings = _StringTable()
+        pairs:dict[tuple[str, str], int] = {}
+        blockIndexes:dict[bytes, int] = {} # sha1 of payload -> block index
+        blocks = []
+        names = []
+        sketchBlocks = []
+
+        def addBlock(payload:bytes) -> int:
+            digest = hashlib.sha1(payload).digest()
+            result = blockIndexes.get(digest)
+            if result is None:
+                result = blockIndexes[digest] = len(blocks)
+                blocks.append(payload)
+            return result
+
+        for name, data in sketches:
+            names.append(strings.add(name))
+            pairIndexes = [pairs.setdefault((pname, expr), len(pairs)) for pname, expr in data.get("Params", {}).items()]
+            sections = dict(cls.encodeSections(data, strings))
+            del sections[b"PRMS"]
+            sections[b"PRMI"] = cls._packInts(pairIndexes)
+            sketchBlocks += [addBlock(sections[tag]) if tag in sections else -1 for tag in cls.blockTags]
+
+        params = []
+        for pname, expr in pairs:
+            params += [strings.add(pname), strings.add(expr)]
+
+        directory = []
+        body = []
+        offset = 0
+        for payload in blocks:
+            directory += [offset, len(payload)]
+            padded = payload + b"\0" * (cls._align(len(payload)) - len(payload))
+            body.append(padded)
+            offset += len(padded)
+
+        return cls._packSections([
+            (b"STRS", strings.pack()),
+            (b"PRMS", cls._packInts(params)),
+            (b"NAME", cls._packInts(names)),
+            (b"SKCH", cls._packInts(sketchBlocks)),
+            (b"BDIR", struct.pack("<" + str(len(directory)) + "Q", *directory)),
+            (b"BLKS", b"".join(body))])
+
+    @classmethod
+    def writeFile(cls, filename:str, sketches:list[tuple[str, dict]]):
+        cls.release(filename)
+        with open(filename, "wb") as file:
+            file.write(cls.encode(sketches))
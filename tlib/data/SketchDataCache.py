@@ -0,0 +1,65 @@
+import os
+from collections import OrderedDict
+
+class SketchDataCache:
+    # Decoded SketchData by source, least recently used entries are dropped past maxSize entries or maxBytes in total.
+    # Sizes are each value's approximateSize (estimated from its point and record counts), so a few large
+    # sketches can't hold much more than maxBytes.
+    # Keys are tuples naming the source: ("builtIn", name), ("file", path, mtime, size) or ("clipboard", contentHash),
+    # so an edited file or new clipboard text gets a new key rather than a stale hit.
+    # Cached instances are shared, treat them as read only (decoders only read them).
+    maxSize = 32
+    maxBytes = 64 * 1024 * 1024
+    totalBytes = 0
+    hits = 0
+    misses = 0
+    _entries:OrderedDict = OrderedDict() # key -> (value, approximate size)
+
+    @classmethod
+    def get(cls, key:tuple, create):
+        # returns the cached value for key, or calls create() and caches its result
+        if key in cls._entries:
+            cls._entries.move_to_end(key)
+            cls.hits += 1
+            return cls._entries[key][0]
+        cls.misses += 1
+        result = create()
+        size = getattr(result, "approximateSize", 0)
+        cls._entries[key] = (result, size)
+        cls.totalBytes += size
+        # the newest entry is always kept, even if it alone is over maxBytes
+        while len(cls._entries) > cls.maxSize or (cls.totalBytes > cls.maxBytes and len(cls._entries) > 1):
+            cls.totalBytes -= cls._entries.popitem(last = False)[1][1]
+        return result
+
+    @classmethod
+    def builtInKey(cls, name:str) -> tuple:
+        return ("builtIn", name)
+
+    @classmethod
+    def fileKey(cls, path:str) -> tuple:
+        stat = os.stat(path)
+        return ("file", os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def clipboardKey(cls, contentHash:str) -> tuple:
+        return ("clipboard", contentHash)
+
+    @classmethod
+    def invalidatePath(cls, path:str):
+        # drops every version of a file, call before rewriting it so cached data doesn't keep the old contents alive
+        path = os.path.abspath(path)
+        for key in [key for key in cls._entries if key[0] == "file" and key[1] == path]:
+            cls.totalBytes -= cls._entries.pop(key)[1]
+
+    @classmethod
+    def clear(cls):
+        cls._entries.clear()
+        cls.totalBytes = 0
+        cls.hits = 0
+        cls.misses = 0
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return {"hits":cls.hits, "misses":cls.misses, "size":len(cls._entries), "maxSize":cls.maxSize,\
+            "bytes":cls.totalBytes, "maxBytes":cls.maxBytes}
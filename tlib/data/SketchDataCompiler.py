@@ -0,0 +1,110 @@
+import re, ast
+
+class CompiledParam:
+    __slots__ = ("kind", "value")
+    # kind is the encoding letter. p/c/e/o values are ints, a/s are tuples of indexes,
+    # v is a tuple of numbers (or the raw string), d is the expression with the d[...] stripped.
+    def __init__(self, kind:str, value):
+        self.kind = kind
+        self.value = value
+
+class CompiledCurve:
+    __slots__ = ("kind", "isConstruction", "isFixed", "params", "text")
+    def __init__(self, kind:str, isConstruction:bool, isFixed:bool, params:list[CompiledParam], text:str):
+        self.kind = kind
+        self.isConstruction = isConstruction
+        self.isFixed = isFixed
+        self.params = params
+        self.text = text
+
+class CompiledRecord:
+    __slots__ = ("kind", "params", "text")
+    # constraints and dimensions
+    def __init__(self, kind:str, params:list[CompiledParam], text:str):
+        self.kind = kind
+        self.params = params
+        self.text = text
+
+class SketchDataCompiler:
+    # Turns the encoded chain, constraint, dimension and param strings into typed records once,
+    # so repeated decodes of the same SketchData skip all regex and literal parsing.
+
+    # can't capture repeating groups with re, so max 4 params per curve.
+    chainPattern = re.compile(r"([xX])([fF])([LACEOS])([pvase][0-9\[\]\.\-,|]*)([pvase][0-9\[\]\.\-,|]*)?([pvase][0-9\[\]\.\-,|]*)?([pvase][0-9\[\]\.\-,|]*)?")
+    constraintPattern = re.compile(r"(VH|PA|PE|EQ|CC|CL|CO|MI|OC|OF|SY|SM|TA)([pcav][0-9|\[\]\.\-,]*)([pcav][0-9|\[\]\.\-,]*)?([pcav][0-9|\[\]\.\-,]*)?")
+    dimensionPattern = re.compile(r"(SLD|SOD|SAD|SDD|SRD|SMA|SMI|SCC|SOC)([pcvo][^pcvod]*|d\[[^\]]*\])([pcvoe][^pcvoed]*|d\[[^\]]*\])?([pcvoe][^pcvoed]*|d\[[^\]]*\])?([pcvoe][^pcvoed]*|d\[[^\]]*\])?([pcvoe][^pcvoed]*|d\[[^\]]*\])?")
+
+    constraintDrawOrder = ['CO', 'PE', 'VH', 'TA', 'EQ', 'PA', 'MI', 'SY', 'CL', 'CC', 'SM', 'OF']
+
+    @classmethod
+    def compileChains(cls, chains:list[str]) -> list[list[CompiledCurve]]:
+        # segments that fail to parse keep their text with kind None
+        result = []
+        for chain in chains:
+            compiledChain = []
+            for seg in chain.split(" "):
+                parse = cls.chainPattern.search(seg)
+                params = cls._compileParamsOrNone(parse.groups()[3:]) if parse else None
+                if params is not None:
+                    isConstruction = parse.group(1) == "x"
+                    isFixed = parse.group(2) == "f"
+                    compiledChain.append(CompiledCurve(parse.group(3), isConstruction, isFixed, params, seg))
+                else:
+                    compiledChain.append(CompiledCurve(None, False, False, [], seg))
+            result.append(compiledChain)
+        return result
+
+    @classmethod
+    def compileConstraints(cls, constraints:list[str]) -> list[CompiledRecord]:
+        # sorted in draw order, unparsable constraints keep their text with kind None
+        result = [cls._compileRecord(con, cls.constraintPattern) for con in constraints]
+        order = cls.constraintDrawOrder
+        result.sort(key=lambda rec: order.index(rec.kind) if rec.kind in order else len(order))
+        return result
+
+    @classmethod
+    def compileDimensions(cls, dimensions:list[str]) -> list[CompiledRecord]:
+        return [cls._compileRecord(dim, cls.dimensionPattern) for dim in dimensions]
+
+    @classmethod
+    def compileUserParams(cls, params:dict[str,str]) -> dict[str,str]:
+        return {name:cls.stripDParam(expr) for name, expr in params.items()}
+
+    @classmethod
+    def compileParams(cls, params) -> list[CompiledParam]:
+        return [cls.compileParam(param) for param in params if param]
+
+    @classmethod
+    def compileParam(cls, param:str) -> CompiledParam:
+        kind = param[0]
+        val = param[1:]
+        value = None
+        if kind in "pceo": # point, curve, enum, object index (so far just used for tracking offset constraints)
+            value = int(val)
+        elif kind == "v": # array of values
+            value = tuple(ast.literal_eval(val)) if val.startswith("[") else val
+        elif kind == "d": # expression
+            value = cls.stripDParam(val)
+        elif kind in "as": # list of curve indexes, list of point indexes (for splines)
+            value = tuple(int(idx) for idx in val.split("|"))
+        return CompiledParam(kind, value)
+
+    @classmethod
+    def stripDParam(cls, dParam:str) -> str:
+        firstD = dParam.index('[') + 1
+        return dParam[firstD:-1] # strip the outsides of d[...] or [...]
+
+    @classmethod
+    def _compileRecord(cls, text:str, pattern:re.Pattern) -> CompiledRecord:
+        parse = pattern.search(text)
+        params = cls._compileParamsOrNone(parse.groups()[1:]) if parse else None
+        if params is None:
+            return CompiledRecord(None, [], text)
+        return CompiledRecord(parse.group(1), params, text)
+
+    @classmethod
+    def _compileParamsOrNone(cls, params):
+        try:
+            return cls.compileParams(params)
+        except (ValueError, SyntaxError, TypeError):
+            return None
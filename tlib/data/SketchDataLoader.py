@@ -0,0 +1,67 @@
+import ast
+
+class SketchDataError(ValueError):
+    def __init__(self, message:str, line:int = 0, column:int = 0):
+        self.line = line
+        self.column = column
+        super().__init__(message + " (line " + str(line) + ", column " + str(column) + ")")
+
+class SketchDataLoader:
+    # Parses Turtle data without eval. The format is a python literal (dicts, lists, strings, numbers)
+    # with # comments, so the python parser handles the grammar and only literal nodes are accepted.
+    header = "{#Turtle Generated Data"
+
+    # nodes ast.literal_eval accepts, used to locate the offending node for error reporting
+    _literalNodes = (ast.Expression, ast.Constant, ast.Tuple, ast.List, ast.Set, ast.Dict, ast.Load,\
+        ast.UnaryOp, ast.UAdd, ast.USub, ast.BinOp, ast.Add, ast.Sub)
+
+    @classmethod
+    def isTurtleData(cls, text:str) -> bool:
+        return text is not None and text.startswith(cls.header)
+
+    @classmethod
+    def loadSketchData(cls, text:str) -> dict:
+        result = cls.loadLiteral(text)
+        if not isinstance(result, dict):
+            raise SketchDataError("Turtle data must be a dictionary, found " + type(result).__name__, 1, 1)
+        return result
+
+    @classmethod
+    def loadFile(cls, filename:str) -> dict:
+        with open(filename, "r") as file:
+            return cls.loadSketchData(file.read())
+
+    @classmethod
+    def loadLiteral(cls, text:str):
+        try:
+            tree = ast.parse(text.lstrip(" \t"), mode="eval")
+        except SyntaxError as e:
+            raise SketchDataError("Malformed Turtle data: " + str(e.msg), e.lineno or 0, e.offset or 0) from None
+
+        try:
+            return ast.literal_eval(tree)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            node = cls._firstNonLiteralNode(tree)
+            line = getattr(node, "lineno", 0) if node else 0
+            column = getattr(node, "col_offset", -1) + 1 if node else 0
+            kind = type(node).__name__ if node else "value"
+            raise SketchDataError("Unsupported " + kind + " in Turtle data", line, column) from None
+
+    @classmethod
+    def _firstNonLiteralNode(cls, tree:ast.AST):
+        result = None
+        for node in ast.walk(tree):
+            isLiteral = isinstance(node, cls._literalNodes) and not cls._isNonNumericOp(node)
+            if not isLiteral and hasattr(node, "lineno"):
+                if result is None or (node.lineno, node.col_offset) < (result.lineno, result.col_offset):
+                    result = node
+        return result
+
+    @classmethod
+    def _isNonNumericOp(cls, node:ast.AST) -> bool:
+        # literal_eval only allows +/- on numbers (signed values and complex literals)
+        if isinstance(node, ast.UnaryOp):
+            return not (isinstance(node.operand, ast.Constant) and isinstance(node.operand.value, (int, float, complex)))
+        if isinstance(node, ast.BinOp):
+            return not (isinstance(node.left, (ast.Constant, ast.UnaryOp)) and isinstance(node.right, ast.Constant))
+        return False
@@ -0,0 +1,247 @@
+import os, re, ast, json, struct, threading, traceback
+from .SketchDataLoader import SketchDataLoader, SketchDataError
+from .SketchDataBinary import SketchDataBinary, _StringTable
+
+class SketchLibrary:
+    # Index of a directory of .tsk/.tskb sketches, kept in a JSON sidecar in that directory.
+    # Each entry holds what the paste dialog needs to browse without loading sketches: name, point and curve counts,
+    # PointBounds, parameter names, named profiles and an optional thumbnail (a .png beside the sketch with the same name).
+    # Summaries come from the binary section directory or a line scan of the text layout, never a full decode.
+    # refresh() only re-reads files whose modification time or size changed.
+    indexName = ".turtleLibrary.json"
+    version = 1
+    extensions = (".tsk", ".tskb")
+    thumbnailExtension = ".png"
+    _libraries:dict = {}
+    _lock = threading.Lock()
+
+    _textSection = re.compile(r"^'(\w+)':")
+    _quotedKey = re.compile(r"^\s*'([^']*)'")
+
+    def __init__(self, directory:str):
+        self.directory = os.path.abspath(directory)
+        self.indexPath = os.path.join(self.directory, self.indexName)
+        self.entries:dict[str, dict] = {} # by path relative to the directory
+        self._searchText:dict[str, str] = {}
+
+    @classmethod
+    def create(cls, directory:str):
+        result = cls(directory)
+        result.load()
+        result.refresh()
+        return result
+
+    @classmethod
+    def forDirectory(cls, directory:str):
+        # one library per directory for the session, refreshed on each request so new or edited files show up
+        key = os.path.abspath(directory)
+        with cls._lock:
+            result = cls._libraries.get(key)
+            if result is None:
+                result = cls._libraries[key] = cls(key)
+                result.load()
+        result.refresh()
+        return result
+
+    # ---- index ----
+
+    def load(self):
+        self.entries = {}
+        if os.path.exists(self.indexPath):
+            try:
+                with open(self.indexPath, "r") as file:
+                    index = json.load(file)
+                if index.get("version") == self.version:
+                    self.entries = index.get("entries", {})
+            except (OSError, ValueError):
+                print('Failed:\n{}'.format(traceback.format_exc())) # a bad sidecar is rebuilt by refresh
+        self._searchText = {path:self._entrySearchText(entry) for path, entry in self.entries.items()}
+
+    def save(self):
+        # written to a temp file and swapped in, so a reader never sees half an index
+        tempPath = self.indexPath + ".tmp"
+        with open(tempPath, "w") as file:
+            json.dump({"version":self.version, "entries":self.entries}, file, indent=1)
+        os.replace(tempPath, self.indexPath)
+
+    def refresh(self) -> bool:
+        # returns True if the index changed (and was saved)
+        found = {}
+        thumbnails = set()
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for filename in files:
+                stem, ext = os.path.splitext(filename)
+                ext = ext.lower()
+                if ext in self.extensions:
+                    found[os.path.relpath(os.path.join(root, filename), self.directory)] = stem
+                elif ext == self.thumbnailExtension:
+                    thumbnails.add(os.path.relpath(os.path.join(root, stem), self.directory))
+
+        changed = False
+        for path in list(self.entries.keys()):
+            if path not in found:
+                del self.entries[path]
+                self._searchText.pop(path, None)
+                changed = True
+
+        for path, name in found.items():
+            fullPath = os.path.join(self.directory, path)
+            try:
+                stat = os.stat(fullPath)
+            except OSError:
+                continue
+            thumbnail = os.path.splitext(path)[0] + self.thumbnailExtension if os.path.splitext(path)[0] in thumbnails else None
+            entry = self.entries.get(path)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                if entry.get("thumbnail") != thumbnail:
+                    entry["thumbnail"] = thumbnail
+                    changed = True
+                continue
+            try:
+                summary = self.summarizeFile(fullPath)
+            except (OSError, SyntaxError, ValueError, struct.error):
+                print('Failed:\n{}'.format(traceback.format_exc()))
+                summary = None
+            if summary is None: # not Turtle data, drop any old entry
+                if self.entries.pop(path, None) is not None:
+                    self._searchText.pop(path, None)
+                    changed = True
+                continue
+            summary.update({"name":name, "file":path, "mtime":stat.st_mtime_ns, "size":stat.st_size, "thumbnail":thumbnail})
+            self.entries[path] = summary
+            self._searchText[path] = self._entrySearchText(summary)
+            changed = True
+
+        if changed:
+            self.save()
+        return changed
+
+    # ---- lookup ----
+
+    def search(self, text:str, limit:int = None) -> list[dict]:
+        # every whitespace separated term must appear in the name, a parameter name or a profile name
+        terms = text.lower().split()
+        result = [self.entries[path] for path, searchText in self._searchText.items() if all(term in searchText for term in terms)]
+        result.sort(key = lambda entry: (entry["name"].lower(), entry["file"]))
+        return result[:limit] if limit else result
+
+    def entryByName(self, name:str) -> dict:
+        for entry in self.entries.values():
+            if entry["name"] == name:
+                return entry
+        return None
+
+    def pathFor(self, entry:dict) -> str:
+        return os.path.join(self.directory, entry["file"])
+
+    def thumbnailFor(self, entry:dict) -> str:
+        return os.path.join(self.directory, entry["thumbnail"]) if entry.get("thumbnail") else None
+
+    def _entrySearchText(self, entry:dict) -> str:
+        return " ".join([entry["name"]] + entry["params"] + entry["namedProfiles"]).lower()
+
+    # ---- summaries ----
+
+    @classmethod
+    def summarizeFile(cls, filename:str) -> dict:
+        # returns None if the file isn't Turtle data
+        if SketchDataBinary.isBinaryFile(filename):
+            return cls.summarizeBinary(filename)
+        with open(filename, "r") as file:
+            return cls.summarizeText(file)
+
+    @classmethod
+    def summarizeBinary(cls, filename:str) -> dict:
+        # Point and curve counts come from section lengths, only the strings, bounds, params, named profiles
+        # and the chain count are read.
+        payloads, lengths = SketchDataBinary.readSections(filename, [b"STRS", b"BNDS", b"PRMS", b"NPRF", b"CHNS"])
+        strings = _StringTable.unpack(memoryview(payloads[b"STRS"]))
+        result = {}
+        result["pointCount"] = lengths.get(b"PNTS", 0) // 16
+        # CHNS is a chain count, then per chain a segment count and (opcode, string) pairs per segment
+        chainCount = struct.unpack_from("<i", payloads[b"CHNS"], 0)[0]
+        result["curveCount"] = (lengths[b"CHNS"] // 4 - 1 - chainCount) // 2
+        if b"BNDS" in payloads:
+            bounds = struct.unpack("<4d", payloads[b"BNDS"][:32])
+            result["pointBounds"] = [[bounds[0], bounds[1]], [bounds[2], bounds[3]]]
+        else:
+            result["pointBounds"] = None
+        params = payloads[b"PRMS"]
+        paramIndexes = struct.unpack("<" + str(len(params) // 4) + "i", params)
+        result["params"] = [strings[paramIndexes[i]] for i in range(0, len(paramIndexes), 2)]
+        ints = payloads[b"NPRF"]
+        ints = struct.unpack("<" + str(len(ints) // 4) + "i", ints)
+        named = []
+        pos = 1
+        for _ in range(ints[0]):
+            named.append(strings[ints[pos]])
+            pos += 2 + ints[pos + 1]
+        result["namedProfiles"] = named
+        return result
+
+    @classmethod
+    def summarizeText(cls, lines) -> dict:
+        # Scans the line layout TurtleEncoder writes ('Section': on its own line, one param, chain or profile per line).
+        # Points are counted by their brackets and constraints and dimensions are skipped, nothing is evaluated
+        # except the one line of PointBounds. Text that doesn't follow that layout is parsed in full instead.
+        lines = iter(lines)
+        first = next(lines, "")
+        if not SketchDataLoader.isTurtleData(first):
+            return None
+        result = {"pointCount":0, "curveCount":0, "pointBounds":None, "params":[], "namedProfiles":[]}
+        consumed = [first]
+        section = None
+        sawPoints = False
+        for line in lines:
+            consumed.append(line)
+            stripped = line.strip()
+            if section == "Params" or section == "NamedProfiles":
+                # keys here look like section names, so only the closing brace ends these
+                if stripped.startswith("}"):
+                    if section == "NamedProfiles":
+                        break
+                    section = None
+                    continue
+                match = cls._quotedKey.match(stripped)
+                if match:
+                    result["params" if section == "Params" else "namedProfiles"].append(match.group(1))
+                continue
+            match = cls._textSection.match(stripped)
+            if match:
+                section = match.group(1)
+                rest = stripped[match.end():]
+                if section == "PointBounds":
+                    result["pointBounds"] = [list(pt[:2]) for pt in ast.literal_eval(rest.rstrip(","))]
+                    section = None
+                elif section == "Points":
+                    sawPoints = True
+                    result["pointCount"] += rest.count("[") - 1
+                elif rest.endswith("}"): # empty dict on one line
+                    if section == "NamedProfiles":
+                        break
+                    section = None
+                continue
+            if stripped.startswith("]"):
+                section = None
+                continue
+            if section == "Points":
+                result["pointCount"] += stripped.split("#")[0].count("[")
+            elif section == "Chains":
+                match = cls._quotedKey.match(stripped)
+                if match:
+                    result["curveCount"] += len([seg for seg in match.group(1).split(" ") if seg])
+        if not sawPoints:
+            consumed.extend(lines)
+            return cls.summarizeData(SketchDataLoader.loadSketchData("".join(consumed)))
+        return result
+
+    @classmethod
+    def summarizeData(cls, data:dict) -> dict:
+        bounds = data.get("PointBounds")
+        return {
+            "pointCount":len(data.get("Points", [])),
+            "curveCount":sum(len([seg for seg in chain.split(" ") if seg]) for chain in data.get("Chains", [])),
+            "pointBounds":[list(pt[:2]) for pt in bounds] if bounds else None,
+            "params":list(data.get("Params", {}).keys()),
+            "namedProfiles":list(data.get("NamedProfiles", {}).keys())}